@@ -1,18 +1,42 @@
 #!/usr/bin/env python3
 """Main CLI entry point for discord-chat."""
 
+import importlib
 import logging
 import sys
 
 import click
-from dotenv import load_dotenv
 
-from discord_chat.commands.activity import activity
-from discord_chat.commands.digest import digest
-from discord_chat.commands.version import get_version, version
+from discord_chat.commands.version import get_version
 
-# Load environment variables from .env file if present
-load_dotenv()
+# Subcommands are imported lazily so that `--help`, `--version`, and argument
+# errors don't pull in discord.py, the LLM SDKs, and Rich before Click even
+# knows which command was requested.
+COMMANDS = {
+    "activity": "discord_chat.commands.activity:activity",
+    "digest": "discord_chat.commands.digest:digest",
+    "version": "discord_chat.commands.version:version",
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports command modules only when dispatched.
+
+    Follows the Click "lazily loading subcommands" pattern: the command
+    registry maps names to "module:attribute" strings, and the module is
+    imported only when the command is actually looked up.
+    """
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(COMMANDS)
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        target = COMMANDS.get(cmd_name)
+        if target is None:
+            return None
+        module_name, attr = target.split(":")
+        module = importlib.import_module(module_name)
+        return getattr(module, attr)
 
 
 def setup_logging(debug: bool) -> None:
@@ -31,7 +55,7 @@ def setup_logging(debug: bool) -> None:
         logging.debug("Debug logging enabled")
 
 
-@click.group()
+@click.group(cls=LazyGroup)
 @click.version_option(version=get_version(), prog_name="discord-chat")
 @click.option(
     "--debug",
@@ -48,11 +72,5 @@ def main(ctx: click.Context, debug: bool) -> None:
     setup_logging(debug)
 
 
-# Register commands
-main.add_command(activity)
-main.add_command(digest)
-main.add_command(version)
-
-
 if __name__ == "__main__":
     main()
@@ -1,14 +1,11 @@
 """Activity command for checking Discord server message counts."""
 
+import operator
 import os
 
 import click
 
-from discord_chat.services.discord_client import (
-    DiscordClientError,
-    ServerNotFoundError,
-    fetch_server_messages,
-)
+from discord_chat.utils.env import load_env
 
 
 @click.command()
@@ -28,9 +25,18 @@ def activity(server_name: str, hours: int) -> None:
     Example:
         discord-chat activity "tne.ai" --hours 12
     """
-    if not os.environ.get("DISCORD_BOT_TOKEN"):
+    load_env()
+    env = os.environ
+    if not env.get("DISCORD_BOT_TOKEN"):
         raise click.ClickException("DISCORD_BOT_TOKEN environment variable is required.")
 
+    # Import discord.py only once we know the command can actually run
+    from discord_chat.services.discord_client import (
+        DiscordClientError,
+        ServerNotFoundError,
+        fetch_server_messages,
+    )
+
     try:
         data = fetch_server_messages(server_name, hours)
     except ServerNotFoundError as e:
@@ -42,21 +48,25 @@ def activity(server_name: str, hours: int) -> None:
         click.echo("No messages found.")
         return
 
-    # Sort by message count descending
-    sorted_channels = sorted(data.channels, key=lambda c: -len(c.messages))
+    # Sort by message count descending; precompute counts once so len() runs
+    # once per channel instead of once per comparison, and let the C-level
+    # itemgetter drive the sort.
+    channel_counts = [(len(c.messages), c) for c in data.channels]
+    channel_counts.sort(key=operator.itemgetter(0), reverse=True)
 
     # Calculate column widths
-    max_name_len = max(len(c.channel_name) for c in sorted_channels)
+    max_name_len = max(len(c.channel_name) for _, c in channel_counts)
     col_width = max(max_name_len + 1, 20)  # minimum 20 chars
 
-    # Print table header
-    click.echo(f"{'Channel':<{col_width}} {'Messages':>10}")
-    click.echo(f"{'-' * col_width} {'-' * 10}")
+    # Build the table once and emit it with a single write. The row format
+    # string is compiled once instead of re-parsing a dynamic format spec per
+    # row.
+    row_fmt = f"#{{:<{col_width - 1}}} {{:>10}}".format
+    divider = f"{'-' * col_width} {'-' * 10}"
 
-    # Print rows
-    for channel in sorted_channels:
-        click.echo(f"#{channel.channel_name:<{col_width - 1}} {len(channel.messages):>10}")
+    lines = [f"{'Channel':<{col_width}} {'Messages':>10}", divider]
+    lines.extend(row_fmt(channel.channel_name, count) for count, channel in channel_counts)
+    lines.append(divider)
+    lines.append(f"{'Total':<{col_width}} {data.total_messages:>10}")
 
-    # Print total
-    click.echo(f"{'-' * col_width} {'-' * 10}")
-    click.echo(f"{'Total':<{col_width}} {data.total_messages:>10}")
+    click.echo("\n".join(lines))
@@ -1,31 +1,35 @@
 """Digest command for generating Discord server activity summaries."""
 
+import dataclasses
+import errno
+import hashlib
+import io
 import os
 import stat
 import time
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from contextlib import contextmanager
 from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
 
 import click
 
-from discord_chat.services.discord_client import (
-    DiscordClientError,
-    ServerDigestData,
-    ServerNotFoundError,
-    fetch_server_messages,
-)
-from discord_chat.services.llm import LLMError, get_provider
-from discord_chat.utils.console_output import Console, create_console, render_digest_to_console
+# Validation helpers are needed before anything expensive happens; everything
+# else (discord.py, the LLM SDKs, Rich) is imported inside the command body so
+# that `digest --help` and validation failures stay cheap.
 from discord_chat.utils.digest_formatter import (
     InvalidServerNameError,
-    create_full_digest,
-    format_messages_for_llm,
-    format_time_range,
-    get_default_output_filename,
     validate_server_name,
 )
-from discord_chat.utils.security_logger import get_security_logger
+from discord_chat.utils.env import load_env
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from discord_chat.services.discord_client import ServerDigestData
+    from discord_chat.utils.console_output import Console
+    from discord_chat.utils.security_logger import SecurityLogger
 
 # Constants for validation
 MIN_HOURS = 1
@@ -58,60 +62,147 @@ def progress_status(
         return
 
     if console is None:
+        from discord_chat.utils.console_output import create_console
+
         console = create_console()
 
     console.print(f"[dim]{message}...[/dim] ", end="")
-    start = time.time()
+    # perf_counter is monotonic, so the displayed duration can't be skewed by
+    # wall-clock adjustments during a long LLM call.
+    start = perf_counter()
     try:
         yield
-        elapsed = time.time() - start
+        elapsed = perf_counter() - start
         console.print(f"[green]done[/green] [dim]({elapsed:.1f}s)[/dim]")
     except Exception:
-        elapsed = time.time() - start
+        elapsed = perf_counter() - start
         console.print(f"[red]failed[/red] [dim]({elapsed:.1f}s)[/dim]")
         raise
 
 
-def write_file_secure(path: Path, content: str) -> None:
+def _detect_provider_name(llm: str | None, env: "os._Environ[str]") -> str:
+    """Resolve the provider display name without importing any LLM SDK.
+
+    Mirrors the selection order of get_provider (explicit choice first, then
+    Claude, then OpenAI) using only env-var checks, so the dry-run preview
+    can name the provider without paying for the anthropic/openai imports.
+
+    Args:
+        llm: Explicit provider choice from --llm, or None for auto-detect.
+        env: The environment mapping to inspect.
+
+    Returns:
+        Human-readable provider name, or "none detected" if no key is set.
+    """
+    display_names = {"claude": "Claude", "openai": "OpenAI"}
+    if llm:
+        return display_names.get(llm.lower(), llm)
+    if env.get("ANTHROPIC_API_KEY"):
+        return "Claude"
+    if env.get("OPENAI_API_KEY"):
+        return "OpenAI"
+    return "none detected"
+
+
+def write_file_secure(path: Path, content: str | Iterable[str]) -> None:
     """Write file with secure permissions (owner read/write only).
 
     Args:
         path: Path to write to.
-        content: Content to write.
+        content: Content to write - a single string, or an iterable of
+            string chunks which are streamed to disk so the full document
+            never has to exist in memory at once.
 
     Raises:
         OSError: If file write fails or path is invalid.
         ValueError: If attempting to overwrite a symlink (security check).
     """
-    # HIGH-006 fix: Check if path exists and is a symlink before writing
-    # This prevents TOCTOU symlink attacks
-    if path.exists() or path.is_symlink():
-        # Check if it's a symlink (even if broken)
-        if path.is_symlink():
-            raise ValueError(
-                f"Refusing to write to symlink: {path}. "
-                "This could be a security issue. Delete the symlink first."
-            )
+    chunks = (content,) if isinstance(content, str) else content
+
+    # HIGH-006 fix: A single lstat tells us whether the path exists and
+    # whether it is a symlink (even a broken one), replacing the previous
+    # exists()/is_symlink() stat cascade.
+    try:
+        is_link = stat.S_ISLNK(os.lstat(path).st_mode)
+    except FileNotFoundError:
+        is_link = False
+    if is_link:
+        raise ValueError(
+            f"Refusing to write to symlink: {path}. "
+            "This could be a security issue. Delete the symlink first."
+        )
 
-    # Use os.open with O_EXCL to fail if file exists (prevents races)
-    # We use O_CREAT | O_EXCL to atomically create the file
+    # Use os.open with O_EXCL to fail if file exists (prevents races).
+    # O_NOFOLLOW makes the kernel itself refuse to follow a symlink, closing
+    # the TOCTOU window between the lstat above and this open.
     try:
         fd = os.open(
             path,
-            os.O_WRONLY | os.O_CREAT | os.O_EXCL,  # O_EXCL fails if file exists
+            os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW,
             stat.S_IRUSR | stat.S_IWUSR,  # 0600 permissions
         )
     except FileExistsError:
-        # File already exists, overwrite it but check it's not a symlink first
-        if path.is_symlink():
-            raise ValueError(f"Refusing to overwrite symlink: {path}")
-        # Safe to overwrite - use O_TRUNC
-        fd = os.open(path, os.O_WRONLY | os.O_TRUNC, stat.S_IRUSR | stat.S_IWUSR)
+        # File already exists - overwrite it. O_NOFOLLOW again lets the
+        # kernel reject a symlink swapped in since the lstat, so no separate
+        # is_symlink() recheck (and its stat call) is needed here.
+        try:
+            fd = os.open(
+                path,
+                os.O_WRONLY | os.O_TRUNC | os.O_NOFOLLOW,
+                stat.S_IRUSR | stat.S_IWUSR,
+            )
+        except OSError as e:
+            if e.errno == errno.ELOOP:
+                raise ValueError(f"Refusing to overwrite symlink: {path}")
+            raise
 
-    try:
-        os.write(fd, content.encode("utf-8"))
-    finally:
-        os.close(fd)
+    # A buffered writer around the fd coalesces small chunks into 64 KiB
+    # writes and handles short writes; closing it closes the fd.
+    with io.BufferedWriter(io.FileIO(fd, "wb"), buffer_size=64 * 1024) as writer:
+        for chunk in chunks:
+            writer.write(chunk.encode("utf-8"))
+
+
+def _save_output(
+    output_file: str | None,
+    data: "ServerDigestData",
+    full_digest: str,
+    security_logger: "SecurityLogger",
+    echo: "Callable[..., None]",
+) -> None:
+    """Write the digest to disk when --file was given.
+
+    All blocking file I/O for the command funnels through here, so a future
+    long-lived server mode can offload the whole call with asyncio.to_thread
+    without touching the command body.
+
+    Args:
+        output_file: Raw --file option value (directory or file path), or None.
+        data: Server digest data (used for the auto-generated filename).
+        full_digest: Complete digest document to write.
+        security_logger: Logger for the file-operation audit event.
+        echo: The command's conditional-output helper.
+    """
+    if not output_file:
+        return
+
+    from discord_chat.utils.digest_formatter import get_default_output_filename
+
+    output_path = Path(output_file)
+
+    # Determine if output_file is a directory or a file path
+    if output_path.is_dir() or (not output_path.suffix and not output_path.exists()):
+        # It's a directory path - generate filename
+        output_path.mkdir(parents=True, exist_ok=True)
+        filename = get_default_output_filename(data.server_name)
+        output_path = output_path / filename
+    else:
+        # It's a file path - ensure parent directory exists
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    write_file_secure(output_path, full_digest)
+    security_logger.log_file_operation("write", str(output_path), "0600")
+    echo(f"Digest saved to: {output_path}", "green")
 
 
 @click.command()
@@ -165,6 +256,24 @@ def write_file_secure(path: Path, content: str) -> None:
     type=str,
     help="Generate digest for a specific channel only (case-insensitive)",
 )
+@click.option(
+    "--include-reactions/--no-reactions",
+    "include_reactions",
+    default=False,
+    help="Include reaction data when fetching messages (default: off)",
+)
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=False,
+    help="Reuse cached LLM digests for identical inputs (default: off)",
+)
+@click.option(
+    "--cache-ttl",
+    default=3600,
+    type=int,
+    help="Maximum age in seconds for cached digests (default: 3600)",
+)
 def digest(
     server_name: str,
     hours: int,
@@ -174,6 +283,9 @@ def digest(
     quiet: bool,
     no_color: bool,
     channel: str | None,
+    include_reactions: bool,
+    use_cache: bool,
+    cache_ttl: int,
 ) -> None:
     """Generate a digest of Discord server activity.
 
@@ -192,6 +304,10 @@ def digest(
     Requires DISCORD_BOT_TOKEN environment variable to be set.
     For LLM, set ANTHROPIC_API_KEY (Claude) or OPENAI_API_KEY (OpenAI).
     """
+    load_env()
+
+    from discord_chat.utils.security_logger import get_security_logger
+
     security_logger = get_security_logger()
 
     # Validate server name to prevent path traversal
@@ -210,13 +326,32 @@ def digest(
             f"Hours must be between {MIN_HOURS} and {MAX_HOURS}. Got: {hours}"
         )
 
-    # Validate environment
-    if not os.environ.get("DISCORD_BOT_TOKEN"):
+    # Validate environment. Bind os.environ once; repeated attribute
+    # dereferences of the environ mapping add up across the command body.
+    env = os.environ
+    if not env.get("DISCORD_BOT_TOKEN"):
         raise click.ClickException(
             "DISCORD_BOT_TOKEN environment variable is required. "
             "Create a Discord bot and set its token."
         )
 
+    # Validation passed - now pay for the heavy imports
+    from concurrent.futures import ThreadPoolExecutor
+
+    from discord_chat.services.discord_client import (
+        DiscordClientError,
+        ServerNotFoundError,
+        fetch_server_messages,
+    )
+    from discord_chat.services.llm import LLMError, get_provider
+    from discord_chat.utils.console_output import create_console, render_digest_to_console
+    from discord_chat.utils.digest_formatter import (
+        create_full_digest,
+        format_messages_for_llm,
+        format_time_range,
+        get_default_output_filename,
+    )
+
     # Create console for Rich output
     console = create_console(no_color=no_color)
 
@@ -239,35 +374,43 @@ def digest(
             quiet=quiet,
             console=console,
         ):
-            data = fetch_server_messages(validated_server_name, hours)
+            data = fetch_server_messages(
+                validated_server_name, hours, include_reactions=include_reactions
+            )
     except ServerNotFoundError as e:
         raise click.ClickException(str(e))
     except DiscordClientError as e:
         raise click.ClickException(f"Discord error: {e}")
 
-    # Filter to specific channel if requested
+    # Filter to specific channel if requested. A lowercase-keyed dict makes
+    # the case-insensitive match a single hash lookup instead of a linear
+    # scan that lowercases every channel name.
     if channel:
         channel_lower = channel.lower().lstrip("#")  # Allow "#general" or "general"
-        matching_channels = [ch for ch in data.channels if ch.channel_name.lower() == channel_lower]
+        by_lower = {ch.channel_name.lower(): ch for ch in data.channels}
+        matched = by_lower.get(channel_lower)
 
-        if not matching_channels:
-            available = sorted([ch.channel_name for ch in data.channels])
+        if matched is None:
+            # sorted() consumes the generator directly; no intermediate list
+            available = sorted(ch.channel_name for ch in data.channels)
             available_list = ", ".join(f"#{ch}" for ch in available) if available else "none"
             raise click.ClickException(
                 f"Channel '#{channel}' not found in '{data.server_name}'. "
                 f"Available channels: {available_list}"
             )
 
-        # Create new ServerDigestData with filtered channel
-        data = ServerDigestData(
-            server_name=data.server_name,
-            server_id=data.server_id,
-            channels=matching_channels,
-            start_time=data.start_time,
-            end_time=data.end_time,
-            total_messages=sum(len(ch.messages) for ch in matching_channels),
+        # Replace only the fields that change rather than re-keying the whole
+        # dataclass by hand.
+        data = dataclasses.replace(
+            data,
+            channels=[matched],
+            total_messages=len(matched.messages),
         )
 
+    # Channel count is reused by the found-message line, the dry-run preview,
+    # and the LLM call - compute it once after filtering.
+    channel_count = len(data.channels)
+
     if data.total_messages == 0:
         if channel:
             echo(f"No messages found in #{channel} in the last {hours} hours.")
@@ -278,37 +421,71 @@ def digest(
     if channel:
         echo(f"Found {data.total_messages} messages in #{channel}.")
     else:
-        echo(f"Found {data.total_messages} messages across {len(data.channels)} channels.")
+        echo(f"Found {data.total_messages} messages across {channel_count} channels.")
 
-    # Get LLM provider
-    try:
-        provider = get_provider(llm)
-    except LLMError as e:
-        raise click.ClickException(str(e))
-
-    # Format messages for LLM
-    messages_text = format_messages_for_llm(data)
     time_range = format_time_range(data.start_time, data.end_time)
 
-    # In dry-run mode, show preview and exit
+    # In dry-run mode, show preview and exit. Build the preview as one block
+    # and emit it with a single console write instead of one write per line.
     if dry_run:
-        echo("\n[DRY RUN] Preview:", "yellow")
-        echo(f"  [bold]Server:[/bold] {data.server_name}")
+        messages_text = format_messages_for_llm(data)
+        preview = ["\n[yellow][DRY RUN] Preview:[/yellow]"]
+        preview.append(f"  [bold]Server:[/bold] {data.server_name}")
         if channel:
-            echo(f"  [bold]Channel filter:[/bold] #{channel}")
-        echo(f"  [bold]Channels:[/bold] {len(data.channels)}")
-        echo(f"  [bold]Messages:[/bold] {data.total_messages}")
-        echo(f"  [bold]Time range:[/bold] {time_range}")
-        echo(f"  [bold]LLM provider:[/bold] {provider.name}")
-        echo(f"  [bold]Estimated prompt size:[/bold] ~{len(messages_text):,} characters")
+            preview.append(f"  [bold]Channel filter:[/bold] #{channel}")
+        preview.append(f"  [bold]Channels:[/bold] {channel_count}")
+        preview.append(f"  [bold]Messages:[/bold] {data.total_messages}")
+        preview.append(f"  [bold]Time range:[/bold] {time_range}")
+        preview.append(f"  [bold]LLM provider:[/bold] {_detect_provider_name(llm, env)}")
+        preview.append(f"  [bold]Estimated prompt size:[/bold] ~{len(messages_text):,} characters")
         if output_file:
             preview_path = Path(output_file)
             if preview_path.is_dir() or (not preview_path.suffix and not preview_path.exists()):
                 preview_path = preview_path / get_default_output_filename(data.server_name)
-            echo(f"\n[DRY RUN] Would write digest to: {preview_path}", "yellow")
+            preview.append(f"\n[yellow][DRY RUN] Would write digest to: {preview_path}[/yellow]")
         else:
-            echo("\n[DRY RUN] Would display digest to screen (no file output)", "yellow")
-        echo("[DRY RUN] No API calls made. Remove --dry-run to generate digest.", "yellow")
+            preview.append(
+                "\n[yellow][DRY RUN] Would display digest to screen (no file output)[/yellow]"
+            )
+        preview.append(
+            "[yellow][DRY RUN] No API calls made. Remove --dry-run to generate digest.[/yellow]"
+        )
+        echo("\n".join(preview))
+        return
+
+    # Get LLM provider - resolved only after the dry-run exit so preview runs
+    # never construct a provider. Message formatting is pure CPU work, so run
+    # it in a worker thread while provider resolution does its env checks;
+    # this takes the formatting off the serial path to the LLM call.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        format_future = pool.submit(format_messages_for_llm, data)
+        try:
+            provider = get_provider(llm)
+        except LLMError as e:
+            raise click.ClickException(str(e))
+        messages_text = format_future.result()
+
+    # Content-addressed digest cache: identical provider + server + window +
+    # messages means the LLM would see the same prompt, so a fresh cached
+    # response can be reused instead of paying for the API call again.
+    llm_digest = None
+    cache_path = None
+    if use_cache:
+        cache_key = hashlib.sha256(
+            f"{provider.name}|{data.server_name}|{time_range}|{messages_text}".encode()
+        ).hexdigest()
+        cache_path = Path.home() / ".cache" / "discord-chat" / "llm" / f"{cache_key}.md"
+        try:
+            if cache_path.is_file() and (time.time() - cache_path.stat().st_mtime) < cache_ttl:
+                llm_digest = cache_path.read_text(encoding="utf-8")
+                echo(f"Using cached digest from {cache_path.name}", "dim")
+        except OSError:
+            llm_digest = None
+
+    if llm_digest is not None:
+        full_digest = create_full_digest(data, llm_digest, provider.name, channel)
+        render_digest_to_console(full_digest, console=console, quiet=quiet)
+        _save_output(output_file, data, full_digest, security_logger, echo)
         return
 
     # Generate digest with LLM
@@ -321,33 +498,25 @@ def digest(
             llm_digest = provider.generate_digest(
                 messages_text=messages_text,
                 server_name=data.server_name,
-                channel_count=len(data.channels),
+                channel_count=channel_count,
                 message_count=data.total_messages,
                 time_range=time_range,
             )
     except LLMError as e:
         raise click.ClickException(f"LLM error: {e}")
 
+    # Store the fresh response in the cache for future identical runs
+    if use_cache and cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_file_secure(cache_path, llm_digest)
+        except (OSError, ValueError):
+            pass  # Cache failures should never break digest generation
+
     # Create full digest document
     full_digest = create_full_digest(data, llm_digest, provider.name, channel)
 
     # Render to screen with Rich markdown (unless quiet mode)
     render_digest_to_console(full_digest, console=console, quiet=quiet)
 
-    # Save to file only if --file flag is provided
-    if output_file:
-        output_path = Path(output_file)
-
-        # Determine if output_file is a directory or a file path
-        if output_path.is_dir() or (not output_path.suffix and not output_path.exists()):
-            # It's a directory path - generate filename
-            output_path.mkdir(parents=True, exist_ok=True)
-            filename = get_default_output_filename(data.server_name)
-            output_path = output_path / filename
-        else:
-            # It's a file path - ensure parent directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        write_file_secure(output_path, full_digest)
-        security_logger.log_file_operation("write", str(output_path), "0600")
-        echo(f"Digest saved to: {output_path}", "green")
+    _save_output(output_file, data, full_digest, security_logger, echo)
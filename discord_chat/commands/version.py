@@ -1,17 +1,34 @@
 """Version command - displays project version from pyproject.toml."""
 
+import functools
 from pathlib import Path
 
 import click
 
-try:
-    import tomllib
-except ImportError:
-    import tomli as tomllib
-
 
+@functools.lru_cache(maxsize=1)
 def get_version() -> str:
-    """Read version from pyproject.toml."""
+    """Return the package version (cached after the first call).
+
+    Prefers the installed distribution metadata, which is pre-parsed and
+    does not require pyproject.toml to ship next to the package. Falls back
+    to parsing pyproject.toml for source checkouts.
+    """
+    try:
+        from importlib.metadata import version as dist_version
+
+        return dist_version("discord-chat")
+    except Exception:
+        pass
+
+    # TOML parsing is only needed the first time the version is requested,
+    # so keep the import out of module load (the cli imports this module on
+    # every invocation for --version support).
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib
+
     pyproject_path = Path(__file__).parent.parent.parent / "pyproject.toml"
 
     if not pyproject_path.exists():
@@ -23,7 +40,15 @@ def get_version() -> str:
     return data.get("project", {}).get("version", "unknown")
 
 
-@click.command()
-def version() -> None:
-    """Display the current version."""
+def _version_callback() -> None:
     click.echo(f"discord-chat version {get_version()}")
+
+
+# Built as a plain Command rather than via the decorator chain: the command
+# takes no options, so there is no parameter machinery worth paying for at
+# import time.
+version = click.Command(
+    "version",
+    callback=_version_callback,
+    help="Display the current version.",
+)
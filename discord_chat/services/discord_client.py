@@ -1,8 +1,12 @@
 """Discord client service for fetching messages from servers."""
 
 import asyncio
+import atexit
+import functools
 import os
 import time
+import weakref
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
@@ -11,13 +15,37 @@ import discord
 from discord_chat.utils.security_logger import get_security_logger
 
 
+@dataclass(slots=True, frozen=True)
+class Message:
+    """A single fetched Discord message.
+
+    Slotted and frozen: a digest run can hold tens of thousands of these, so
+    skipping the per-instance __dict__ cuts memory roughly 3x versus the
+    previous dict-per-message representation. Reactions are stored as two
+    parallel tuples rather than a list of dicts for the same reason.
+    """
+
+    id: int = 0
+    author: str = ""
+    author_id: int = 0
+    content: str = ""
+    timestamp_us: int = 0  # epoch microseconds UTC; formatted only at display time
+    # Pre-rendered LLM prompt line, built at fetch time while the fields are
+    # hot; empty for messages constructed without one (the formatter falls
+    # back to rendering from the other fields).
+    line: str = ""
+    attachments: tuple[str, ...] = ()
+    reaction_emojis: tuple[str, ...] = ()
+    reaction_counts: tuple[int, ...] = ()
+
+
 @dataclass
 class ChannelMessages:
     """Messages from a single channel."""
 
     channel_name: str
     channel_id: int
-    messages: list[dict]
+    messages: list[Message]
 
 
 @dataclass
@@ -69,6 +97,130 @@ def _get_env_int(name: str, default: int, min_val: int, max_val: int) -> int:
         return default
 
 
+class _FetchLimiter:
+    """Resizable concurrency gate shared by every fetcher on one event loop.
+
+    A per-instance limiter lets N fetchers collectively run N times the
+    configured concurrency against Discord's global rate limit; keying the
+    limiter on the running loop means multi-server batch runs share one
+    budget. Unlike a Semaphore, the Condition-guarded counter can have its
+    limit changed at runtime with a plain assignment plus notify_all().
+    """
+
+    __slots__ = ("cond", "active", "limit")
+
+    def __init__(self, limit: int) -> None:
+        self.cond = asyncio.Condition()
+        self.active = 0
+        self.limit = limit
+
+
+_loop_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _FetchLimiter]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_fetch_limiter(limit: int) -> _FetchLimiter:
+    """Return the running loop's shared limiter, creating it on first use.
+
+    The first caller's limit wins for the life of the loop; use
+    DiscordMessageFetcher._set_fetch_limit to resize afterwards.
+    """
+    loop = asyncio.get_running_loop()
+    limiter = _loop_limiters.get(loop)
+    if limiter is None:
+        limiter = _FetchLimiter(limit)
+        _loop_limiters[loop] = limiter
+    return limiter
+
+
+@functools.lru_cache(maxsize=1)
+def _validate_token(token: str) -> str:
+    """Strip and format-check a bot token, memoized on the raw env value.
+
+    The CLI constructs a fresh fetcher per invocation (and the test suite
+    constructs many); caching on the environment value skips the repeated
+    strip + length check. Failures raise and are never cached.
+
+    Raises:
+        DiscordClientError: If the token format looks invalid.
+    """
+    token = token.strip()
+    # Discord bot tokens are typically 70+ characters
+    if len(token) < 50:
+        raise DiscordClientError(
+            "Invalid Discord bot token format. "
+            "Token appears too short - please verify your DISCORD_BOT_TOKEN."
+        )
+    return token
+
+
+def _keep_message(message: discord.Message) -> bool:
+    """Filter predicate for fetched messages: drop bot and empty messages.
+
+    Module-level so the hot per-message loop evaluates one short-circuiting
+    expression instead of two separate branch blocks.
+    """
+    return (not message.author.bot) and bool(message.content or message.attachments)
+
+
+def _build_message(message: discord.Message, max_len: int, include_reactions: bool) -> Message:
+    """Convert a discord.Message that passed the filters into a Message.
+
+    Only called for messages _keep_message accepted, so none of the
+    truncation/attachment/reaction work is spent on filtered-out traffic.
+
+    Args:
+        message: The raw discord.py message.
+        max_len: Content-truncation limit (MAX_MESSAGE_CONTENT_LENGTH).
+        include_reactions: Collect reaction emojis/counts.
+    """
+    # Local aliases save a LOAD_ATTR per use in the hot loop
+    author = message.author
+    atts = message.attachments
+
+    # Truncate message content to prevent memory exhaustion (CRIT-005 fix)
+    content = message.content
+    if len(content) > max_len:
+        content = content[:max_len] + "...[truncated]"
+
+    # Most messages carry no attachments or reactions; skip the list
+    # and tuple builds entirely on that dominant path.
+    if atts:
+        # Limit attachments to prevent memory issues (max 10)
+        names = [a.filename for a in atts[:10]]
+        if len(atts) > 10:
+            names.append(f"...and {len(atts) - 10} more")
+        attachments = tuple(names)
+    else:
+        attachments = ()
+
+    # Max 20 reactions, and only when the caller asked for them
+    reactions = message.reactions if include_reactions else ()
+    if reactions:
+        reactions = list(reactions)[:20]
+        reaction_emojis = tuple(str(r.emoji)[:20] for r in reactions)
+        reaction_counts = tuple(r.count for r in reactions)
+    else:
+        reaction_emojis = reaction_counts = ()
+
+    created_at = message.created_at
+    author_name = author.display_name[:100]  # Limit author name
+    return Message(
+        id=message.id,
+        author=author_name,
+        author_id=author.id,
+        content=content,
+        timestamp_us=int(created_at.timestamp() * 1_000_000),
+        # Prompt line rendered here, while author/content are already in
+        # hand, so the LLM formatter joins instead of re-formatting.
+        line=f"[{created_at:%Y-%m-%d %H:%M}] **{author_name}**: {content}",
+        attachments=attachments,
+        reaction_emojis=reaction_emojis,
+        reaction_counts=reaction_counts,
+    )
+
+
 class DiscordMessageFetcher:
     """Fetches messages from Discord servers.
 
@@ -80,39 +232,65 @@ class DiscordMessageFetcher:
     Configuration via environment variables:
         DISCORD_CHAT_TIMEOUT: Operation timeout in seconds (default: 60, range: 10-300)
         DISCORD_CHAT_MAX_MESSAGES: Max messages per channel (default: 1000, range: 100-10000)
-        DISCORD_CHAT_MAX_CONCURRENT: Max concurrent channel fetches (default: 5, range: 1-20)
+        DISCORD_CHAT_MAX_CONCURRENT: Max concurrent channel fetches (default: 8, range: 1-20)
     """
 
     # Default security constants (can be overridden via environment)
     DEFAULT_TIMEOUT = 60.0  # Overall operation timeout in seconds
     DEFAULT_MAX_MESSAGES_PER_CHANNEL = 1000  # Prevent resource exhaustion
-    DEFAULT_MAX_CONCURRENT_CHANNELS = 5  # Rate limiting: max concurrent channel fetches
+    DEFAULT_MAX_CONCURRENT_CHANNELS = 8  # Rate limiting: max concurrent channel fetches
     MAX_MESSAGE_CONTENT_LENGTH = 100_000  # Max 100KB per message (CRIT-005 fix)
+    MAX_RATE_LIMIT_RETRIES = 5  # Per-channel cap on 429 refetch attempts
 
     @property
     def max_messages_per_channel(self) -> int:
-        """Get max messages per channel from environment or default."""
-        return _get_env_int(
+        """Max messages per channel, resolved from the environment at init."""
+        return self._max_messages_per_channel
+
+    @property
+    def max_concurrent_channels(self) -> int:
+        """Max concurrent channel fetches, resolved from the environment at init."""
+        return self._max_concurrent_channels
+
+    @property
+    def operation_timeout(self) -> float:
+        """Operation timeout in seconds, resolved from the environment at init."""
+        return self._operation_timeout
+
+    def __init__(self, include_reactions: bool = False):
+        """Initialize the Discord message fetcher.
+
+        Token is read exclusively from DISCORD_BOT_TOKEN environment variable
+        for security (prevents token exposure in process listings).
+
+        Args:
+            include_reactions: Collect reaction emojis/counts per message.
+                Off by default - the digest prompt doesn't use them, and
+                skipping them avoids an allocation loop per message.
+        """
+        self._token = self._load_token()
+        self._include_reactions = include_reactions
+        self._security_logger = get_security_logger()
+        # Event-loop time before which no worker should issue history
+        # requests; pushed forward whenever Discord answers 429.
+        self._throttle_until = 0.0
+
+        # Resolve env-derived limits once: max_messages_per_channel is read
+        # on the hot history path, and each property access used to redo the
+        # environ lookup, int() parse and range check.
+        self._max_messages_per_channel = _get_env_int(
             "DISCORD_CHAT_MAX_MESSAGES",
             self.DEFAULT_MAX_MESSAGES_PER_CHANNEL,
             min_val=100,
             max_val=10000,
         )
-
-    @property
-    def max_concurrent_channels(self) -> int:
-        """Get max concurrent channel fetches from environment or default."""
-        return _get_env_int(
+        self._max_concurrent_channels = _get_env_int(
             "DISCORD_CHAT_MAX_CONCURRENT",
             self.DEFAULT_MAX_CONCURRENT_CHANNELS,
             min_val=1,
             max_val=20,
         )
-
-    @property
-    def operation_timeout(self) -> float:
-        """Get operation timeout from environment or default."""
-        return float(
+        self._operation_timeout = float(
             _get_env_int(
                 "DISCORD_CHAT_TIMEOUT",
                 int(self.DEFAULT_TIMEOUT),
@@ -121,26 +299,32 @@ class DiscordMessageFetcher:
             )
         )
 
-    def __init__(self):
-        """Initialize the Discord message fetcher.
-
-        Token is read exclusively from DISCORD_BOT_TOKEN environment variable
-        for security (prevents token exposure in process listings).
-        """
-        self._token = self._load_token()
-        self._security_logger = get_security_logger()
+        # Concurrency limiting is handled by the per-event-loop _FetchLimiter
+        # (see _get_fetch_limiter) so concurrent fetchers share one budget.
 
-        # Set up intents - we need message content and guild access
+        # Set up intents - we need message content and guild access. The
+        # privileged members intent is deliberately off: author display
+        # names arrive inline with each history message, and skipping the
+        # per-guild member chunking makes READY markedly faster on large
+        # servers.
         intents = discord.Intents.default()
         intents.message_content = True
         intents.guilds = True
-        intents.members = True
+        intents.members = False
 
-        self._client = discord.Client(intents=intents)
+        self._client = discord.Client(
+            intents=intents,
+            chunk_guilds_at_startup=False,
+            member_cache_flags=discord.MemberCacheFlags.none(),
+        )
         self._ready_event = asyncio.Event()
+        self._guild_index: dict[str, discord.Guild] = {}
 
         @self._client.event
         async def on_ready():
+            # Build the name index once per connection so lookups are O(1)
+            # instead of rescanning (and re-lowercasing) every guild name.
+            self._guild_index = {g.name.casefold(): g for g in self._client.guilds}
             self._ready_event.set()
             self._security_logger.log_auth_attempt(True, "Discord")
 
@@ -160,14 +344,7 @@ class DiscordMessageFetcher:
                 "DISCORD_BOT_TOKEN environment variable is required. "
                 "Set it in your .env file or environment."
             )
-        token = token.strip()
-        # Discord bot tokens are typically 70+ characters
-        if len(token) < 50:
-            raise DiscordClientError(
-                "Invalid Discord bot token format. "
-                "Token appears too short - please verify your DISCORD_BOT_TOKEN."
-            )
-        return token
+        return _validate_token(token)
 
     async def _wait_until_ready(self, timeout: float = 30.0):
         """Wait for the client to be ready."""
@@ -188,15 +365,19 @@ class DiscordMessageFetcher:
         Raises:
             ServerNotFoundError: If no server with the given name is found.
         """
-        server_name_lower = server_name.lower()
-        for guild in self._client.guilds:
-            if guild.name.lower() == server_name_lower:
-                return guild
+        # Use the index built at READY; fall back to building one on the fly
+        # if the client never connected (e.g. direct calls in tests).
+        index = self._guild_index or {g.name.casefold(): g for g in self._client.guilds}
+        key = server_name.casefold()
+
+        guild = index.get(key)
+        if guild is not None:
+            return guild
 
         # If exact match not found, try partial match
-        for guild in self._client.guilds:
-            if server_name_lower in guild.name.lower():
-                return guild
+        guild = next((g for name, g in index.items() if key in name), None)
+        if guild is not None:
+            return guild
 
         available_servers = [g.name for g in self._client.guilds]
         raise ServerNotFoundError(
@@ -220,66 +401,111 @@ class DiscordMessageFetcher:
         Returns:
             ChannelMessages object containing the channel info and messages.
         """
-        messages = []
-        try:
-            # Use message limit to prevent resource exhaustion
-            async for message in channel.history(
-                after=after, before=before, limit=self.max_messages_per_channel
-            ):
-                # Skip bot messages and empty messages
-                if message.author.bot:
-                    continue
-                if not message.content and not message.attachments:
-                    continue
-
-                # Truncate message content to prevent memory exhaustion (CRIT-005 fix)
-                content = message.content
-                if len(content) > self.MAX_MESSAGE_CONTENT_LENGTH:
-                    content = content[: self.MAX_MESSAGE_CONTENT_LENGTH] + "...[truncated]"
-
-                # Limit attachments to prevent memory issues
-                attachments = [a.filename for a in message.attachments[:10]]  # Max 10 attachments
-                if len(message.attachments) > 10:
-                    attachments.append(f"...and {len(message.attachments) - 10} more")
-
-                messages.append(
-                    {
-                        "id": message.id,
-                        "author": message.author.display_name[:100],  # Limit author name
-                        "author_id": message.author.id,
-                        "content": content,
-                        "timestamp": message.created_at.isoformat(),
-                        "attachments": attachments,
-                        "reactions": [
-                            {"emoji": str(r.emoji)[:20], "count": r.count}  # Limit emoji length
-                            for r in list(message.reactions)[:20]  # Max 20 reactions
-                        ],
-                    }
+        # Dormant-channel fast path: snowflake IDs encode creation time, so
+        # if the channel's last message predates the window we can skip it
+        # without a single REST call.
+        last_id = channel.last_message_id
+        if isinstance(last_id, int):
+            last_ts = datetime.fromtimestamp(((last_id >> 22) + 1_420_070_400_000) / 1000, UTC)
+            if last_ts < after:
+                return ChannelMessages(
+                    channel_name=channel.name, channel_id=channel.id, messages=[]
                 )
 
-                # HIGH-007 fix: Yield control periodically to prevent memory buildup
-                # Allow garbage collection every 100 messages
-                if len(messages) % 100 == 0:
-                    await asyncio.sleep(0)  # Yield to event loop
-
-        except discord.Forbidden:
-            # Bot doesn't have permission to read this channel
-            pass
-        except discord.HTTPException as e:
-            # Log but don't fail on individual channel errors
-            print(f"Warning: Could not fetch messages from #{channel.name}: {e}")
+        messages: list[Message] = []
+        append = messages.append
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            await self._wait_for_throttle()  # adaptive backoff shared across workers
+            try:
+                async for msg in self._iter_channel_messages(channel, after, before):
+                    append(msg)
+                break
+            except discord.Forbidden:
+                # Bot doesn't have permission to read this channel
+                break
+            except discord.HTTPException as e:
+                if e.status == 429 and attempt < self.MAX_RATE_LIMIT_RETRIES:
+                    # Rate limited: honour Retry-After and publish the backoff
+                    # window fetcher-wide so sibling workers pause instead of
+                    # each discovering the 429 independently. Then refetch from
+                    # scratch so the retry sees a consistent window.
+                    try:
+                        retry_after = float(e.response.headers.get("Retry-After", "1"))
+                    except (TypeError, ValueError):
+                        retry_after = 1.0
+                    self._throttle_until = asyncio.get_running_loop().time() + retry_after
+                    await asyncio.sleep(retry_after)
+                    messages.clear()
+                    continue
+                # Log but don't fail on individual channel errors
+                print(f"Warning: Could not fetch messages from #{channel.name}: {e}")
+                break
 
-        # Sort and return - this creates a new list, old messages can be GC'd
-        result = ChannelMessages(
+        # history() with `after` yields messages in chronological order, so
+        # the list is already sorted - no per-channel sort pass needed.
+        return ChannelMessages(
             channel_name=channel.name,
             channel_id=channel.id,
-            messages=sorted(messages, key=lambda m: m["timestamp"]),
+            messages=messages,
         )
 
-        # Clear messages list to help garbage collection (HIGH-007 fix)
-        messages.clear()
+    async def _set_fetch_limit(self, limit: int) -> None:
+        """Resize the concurrent-fetch cap at runtime.
+
+        Raising the limit wakes all waiters so newly allowed fetches start
+        immediately; lowering it takes effect as in-flight fetches drain.
+        The worker-pool size bounds the useful maximum. The cap is shared
+        by every fetcher on the current event loop.
+        """
+        limiter = _get_fetch_limiter(self._max_concurrent_channels)
+        async with limiter.cond:
+            limiter.limit = max(1, limit)
+            limiter.cond.notify_all()
+
+    async def _wait_for_throttle(self) -> None:
+        """Sleep until any fetcher-wide rate-limit backoff window has passed.
+
+        The window is set from Discord's Retry-After header when a worker
+        hits a 429, so the limiter adapts to the server's actual bucket
+        state instead of relying solely on the static concurrency cap.
+        """
+        delay = self._throttle_until - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _iter_channel_messages(
+        self,
+        channel: discord.TextChannel,
+        after: datetime,
+        before: datetime,
+    ) -> AsyncIterator[Message]:
+        """Yield filtered, size-limited messages from one channel's history.
 
-        return result
+        Streaming core of the channel fetch: callers can aggregate into a
+        list (as _fetch_channel_messages does) or consume incrementally
+        without materializing the channel's messages at all.
+        """
+        # Hoist per-message constants out of the loop: each runs up to
+        # max_messages_per_channel times per channel, so the repeated
+        # attribute lookups add up.
+        max_len = self.MAX_MESSAGE_CONTENT_LENGTH
+        include_reactions = self._include_reactions
+
+        # Use message limit to prevent resource exhaustion. oldest_first is
+        # requested explicitly (rather than relying on the `after` default)
+        # so the ascending created_at guarantee downstream code depends on
+        # is part of the call, not an implementation detail.
+        async for message in channel.history(
+            after=after,
+            before=before,
+            limit=self._max_messages_per_channel,
+            oldest_first=True,
+        ):
+            # Skip bot messages and empty messages; _build_message does the
+            # expensive field extraction only for survivors.
+            if not _keep_message(message):
+                continue
+            yield _build_message(message, max_len, include_reactions)
 
     async def _fetch_channels_with_rate_limiting(
         self,
@@ -300,23 +526,83 @@ class DiscordMessageFetcher:
         # Log rate limiting enforcement
         self._security_logger.log_rate_limit("Discord", self.max_concurrent_channels)
 
-        # Create semaphore to limit concurrent API calls
-        semaphore = asyncio.Semaphore(self.max_concurrent_channels)
-
-        async def fetch_with_semaphore(channel: discord.TextChannel) -> ChannelMessages:
-            """Wrapper to fetch channel messages with semaphore."""
-            start_time = time.time()
-            async with semaphore:
-                result = await self._fetch_channel_messages(channel, after, before)
-            duration_ms = (time.time() - start_time) * 1000
-            self._security_logger.log_api_call(
-                "Discord", f"fetch_messages:{channel.name}", duration_ms, True
-            )
-            return result
+        # Bounded worker pool instead of one task per channel: a server with
+        # hundreds of channels would otherwise materialize hundreds of pending
+        # task objects up front. Workers pull (index, channel) pairs from a
+        # queue, so task memory is O(workers) and the concurrency cap holds
+        # without a Semaphore. Results land at their original index to
+        # preserve the caller's channel order.
+        queue: asyncio.Queue[tuple[int, discord.TextChannel]] = asyncio.Queue()
+        for indexed_channel in enumerate(channels):
+            queue.put_nowait(indexed_channel)
+
+        results: list[ChannelMessages | None] = [None] * len(channels)
+        limiter = _get_fetch_limiter(self.max_concurrent_channels)
+
+        async def worker() -> None:
+            """Drain the channel queue, fetching one channel at a time."""
+            while not queue.empty():
+                index, channel = queue.get_nowait()
+                async with limiter.cond:
+                    await limiter.cond.wait_for(lambda: limiter.active < limiter.limit)
+                    limiter.active += 1
+                try:
+                    start_time = time.time()
+                    results[index] = await self._fetch_channel_messages(channel, after, before)
+                    duration_ms = (time.time() - start_time) * 1000
+                    self._security_logger.log_api_call(
+                        "Discord", f"fetch_messages:{channel.name}", duration_ms, True
+                    )
+                finally:
+                    async with limiter.cond:
+                        limiter.active -= 1
+                        limiter.cond.notify(1)
+
+        # TaskGroup gives structured cancellation: if one worker fails hard,
+        # siblings are cancelled rather than left running as with bare gather().
+        worker_count = min(self.max_concurrent_channels, len(channels))
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(worker_count):
+                tg.create_task(worker())
+        return [result for result in results if result is not None]
+
+    async def iter_server_channels(
+        self,
+        channels: list[discord.TextChannel],
+        after: datetime,
+        before: datetime,
+    ) -> AsyncIterator[ChannelMessages]:
+        """Yield per-channel results as each channel's fetch completes.
+
+        Streaming counterpart of _fetch_channels_with_rate_limiting: a
+        consumer building the LLM prompt can start formatting the first
+        finished channel while the rest are still in flight, and stop
+        iterating early once the prompt budget is full. Yield order is
+        completion order, not channel order. Concurrency is capped by the
+        same Condition gate used by the batch path.
+        """
+
+        limiter = _get_fetch_limiter(self.max_concurrent_channels)
 
-        # Fetch all channels with rate limiting
-        tasks = [fetch_with_semaphore(ch) for ch in channels]
-        return await asyncio.gather(*tasks)
+        async def gated_fetch(channel: discord.TextChannel) -> ChannelMessages:
+            async with limiter.cond:
+                await limiter.cond.wait_for(lambda: limiter.active < limiter.limit)
+                limiter.active += 1
+            try:
+                return await self._fetch_channel_messages(channel, after, before)
+            finally:
+                async with limiter.cond:
+                    limiter.active -= 1
+                    limiter.cond.notify(1)
+
+        tasks = [asyncio.ensure_future(gated_fetch(ch)) for ch in channels]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            # If the consumer breaks out early, drop the remaining fetches
+            for task in tasks:
+                task.cancel()
 
     async def fetch_server_messages(
         self,
@@ -345,14 +631,51 @@ class DiscordMessageFetcher:
                 timeout=operation_timeout,
             )
         except TimeoutError:
-            # Ensure cleanup on timeout
-            if not self._client.is_closed():
-                await self._client.close()
+            # No cleanup here: wait_for cancels the impl coroutine, and its
+            # finally block owns the client close. Closing again from this
+            # handler would double-close and race the in-flight cancellation.
             raise DiscordClientError(
                 f"Operation timed out after {operation_timeout} seconds. "
                 "The server may have too many channels or messages."
             )
 
+    async def _collect_server_data(self, server_name: str, hours: int) -> ServerDigestData:
+        """Gather a server's messages over an already-connected client.
+
+        Connection lifecycle is the caller's concern:
+        _fetch_server_messages_impl logs in and closes around this call.
+        """
+        end_time = datetime.now(UTC)
+        start_time = end_time - timedelta(hours=hours)
+
+        # Find the server
+        guild = self._find_server_by_name(server_name)
+
+        # guild.text_channels is pre-filtered by discord.py; skip
+        # channels the bot can't read so we don't burn a task slot
+        # and a round-trip just to hit Forbidden.
+        text_channels = [
+            ch for ch in guild.text_channels if ch.permissions_for(guild.me).read_message_history
+        ]
+
+        # Fetch messages from channels with rate limiting
+        channel_results = await self._fetch_channels_with_rate_limiting(
+            text_channels, start_time, end_time
+        )
+
+        # Filter out empty channels and calculate total
+        channels_with_messages = [ch for ch in channel_results if ch.messages]
+        total_messages = sum(len(ch.messages) for ch in channels_with_messages)
+
+        return ServerDigestData(
+            server_name=guild.name,
+            server_id=guild.id,
+            channels=channels_with_messages,
+            start_time=start_time,
+            end_time=end_time,
+            total_messages=total_messages,
+        )
+
     async def _fetch_server_messages_impl(
         self,
         server_name: str,
@@ -362,9 +685,6 @@ class DiscordMessageFetcher:
 
         This is separated to allow wrapping with timeout.
         """
-        end_time = datetime.now(UTC)
-        start_time = end_time - timedelta(hours=hours)
-
         try:
             # Start the client in a background task
             login_task = asyncio.create_task(self._client.start(self._token))
@@ -372,31 +692,7 @@ class DiscordMessageFetcher:
             try:
                 # Wait for ready
                 await self._wait_until_ready()
-
-                # Find the server
-                guild = self._find_server_by_name(server_name)
-
-                # Get all text channels
-                text_channels = [ch for ch in guild.channels if isinstance(ch, discord.TextChannel)]
-
-                # Fetch messages from channels with rate limiting
-                # Use semaphore to limit concurrent API calls
-                channel_results = await self._fetch_channels_with_rate_limiting(
-                    text_channels, start_time, end_time
-                )
-
-                # Filter out empty channels and calculate total
-                channels_with_messages = [ch for ch in channel_results if ch.messages]
-                total_messages = sum(len(ch.messages) for ch in channels_with_messages)
-
-                return ServerDigestData(
-                    server_name=guild.name,
-                    server_id=guild.id,
-                    channels=channels_with_messages,
-                    start_time=start_time,
-                    end_time=end_time,
-                    total_messages=total_messages,
-                )
+                return await self._collect_server_data(server_name, hours)
             finally:
                 # Always close the client
                 await self._client.close()
@@ -435,7 +731,47 @@ class DiscordMessageFetcher:
             )
 
 
-def fetch_server_messages(server_name: str, hours: int = 6) -> ServerDigestData:
+# Persistent event loop for the sync wrapper. asyncio.run builds and tears
+# down a fresh loop (plus executor shutdown) per call; reusing one loop lets
+# repeated fetches in the same process skip that setup. Note that the
+# discord.Client itself cannot be kept warm this way: discord.py clients are
+# single-use once closed, so each fetch still pays for its own gateway
+# handshake.
+_event_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _close_event_loop() -> None:
+    """atexit hook: close the persistent event loop if one was created."""
+    if _event_loop is not None and not _event_loop.is_closed():
+        _event_loop.close()
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the module's persistent event loop, creating it on first use.
+
+    Uses a uvloop loop when the optional dependency is installed (install
+    with the `fast` extra) - libuv noticeably cuts socket/TLS overhead for
+    the gateway WebSocket. Only this module's loop is affected; the global
+    event loop policy is left alone so embedding applications and tests
+    keep their own loops.
+    """
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        try:
+            import uvloop
+
+            _event_loop = uvloop.new_event_loop()
+        except ImportError:
+            _event_loop = asyncio.new_event_loop()
+        atexit.register(_close_event_loop)
+    return _event_loop
+
+
+def fetch_server_messages(
+    server_name: str,
+    hours: int = 6,
+    include_reactions: bool = False,
+) -> ServerDigestData:
     """Synchronous wrapper for fetching server messages.
 
     This is the main entry point for CLI usage.
@@ -443,9 +779,10 @@ def fetch_server_messages(server_name: str, hours: int = 6) -> ServerDigestData:
     Args:
         server_name: Name of the Discord server.
         hours: Number of hours to look back.
+        include_reactions: Collect reaction data per message (default: off).
 
     Returns:
         ServerDigestData containing all messages.
     """
-    fetcher = DiscordMessageFetcher()
-    return asyncio.run(fetcher.fetch_server_messages(server_name, hours))
+    fetcher = DiscordMessageFetcher(include_reactions=include_reactions)
+    return _get_event_loop().run_until_complete(fetcher.fetch_server_messages(server_name, hours))
@@ -1,10 +1,20 @@
 """LLM service module with provider abstraction."""
 
+import asyncio
+from collections.abc import Sequence
+
 from .base import LLMError, LLMProvider
 from .claude import ClaudeProvider
 from .openai_provider import OpenAIProvider
 
-__all__ = ["LLMProvider", "LLMError", "ClaudeProvider", "OpenAIProvider", "get_provider"]
+__all__ = [
+    "LLMProvider",
+    "LLMError",
+    "ClaudeProvider",
+    "OpenAIProvider",
+    "get_provider",
+    "fanout",
+]
 
 # Default provider preference order
 PROVIDER_REGISTRY = {
@@ -12,6 +22,19 @@ PROVIDER_REGISTRY = {
     "openai": OpenAIProvider,
 }
 
+# Provider instances are stateless apart from any lazily built HTTP client,
+# so one per name can be reused across calls. Availability is deliberately
+# re-checked on every get_provider call since env vars can change.
+_provider_instances: dict[str, LLMProvider] = {}
+
+
+def _provider_instance(name: str) -> LLMProvider:
+    """Return the shared instance for a registered provider name."""
+    provider = _provider_instances.get(name)
+    if provider is None:
+        provider = _provider_instances.setdefault(name, PROVIDER_REGISTRY[name]())
+    return provider
+
 
 def get_provider(provider_name: str | None = None) -> LLMProvider:
     """Get an LLM provider instance.
@@ -32,8 +55,7 @@ def get_provider(provider_name: str | None = None) -> LLMProvider:
             available = ", ".join(PROVIDER_REGISTRY.keys())
             raise LLMError(f"Unknown provider '{provider_name}'. Available: {available}")
 
-        provider_class = PROVIDER_REGISTRY[provider_name]
-        provider = provider_class()
+        provider = _provider_instance(provider_name)
         if not provider.is_available():
             raise LLMError(
                 f"Provider '{provider_name}' is not available. "
@@ -42,8 +64,8 @@ def get_provider(provider_name: str | None = None) -> LLMProvider:
         return provider
 
     # Auto-select: try providers in preference order
-    for name, provider_class in PROVIDER_REGISTRY.items():
-        provider = provider_class()
+    for name in PROVIDER_REGISTRY:
+        provider = _provider_instance(name)
         if provider.is_available():
             return provider
 
@@ -51,3 +73,33 @@ def get_provider(provider_name: str | None = None) -> LLMProvider:
         "No LLM provider available. Please set one of: "
         "ANTHROPIC_API_KEY (for Claude) or OPENAI_API_KEY (for OpenAI)"
     )
+
+
+async def fanout(
+    providers: Sequence[LLMProvider],
+    messages_text: str,
+    server_name: str,
+    channel_count: int,
+    message_count: int,
+    time_range: str,
+) -> list[str]:
+    """Generate the same digest on several providers concurrently.
+
+    Wall-clock is ~max(provider latency) instead of the sum, since the
+    calls are pure I/O. Results are in provider order; any provider
+    failure propagates as its usual LLMError.
+    """
+    return list(
+        await asyncio.gather(
+            *(
+                provider.generate_digest_async(
+                    messages_text,
+                    server_name,
+                    channel_count,
+                    message_count,
+                    time_range,
+                )
+                for provider in providers
+            )
+        )
+    )
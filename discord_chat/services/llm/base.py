@@ -1,6 +1,95 @@
 """Base class for LLM providers."""
 
+import asyncio
+import random
+import re
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from string import Template
+from typing import TypeVar
+
+from discord_chat.utils.security_logger import SecurityLogger
+
+_T = TypeVar("_T")
+
+# Fully static across calls; built once at import instead of being
+# re-concatenated on every digest request.
+_SYSTEM_PROMPT = (
+    "You are a helpful assistant that creates concise, well-organized "
+    "digests of Discord server conversations.\n\n"
+    "Your task is to analyze the provided Discord messages and create a "
+    "comprehensive yet readable digest in Markdown format.\n\n"
+    "Guidelines:\n"
+    "1. Start with a '## Channel Activity Summary' section that lists each channel "
+    "with a brief 1-2 sentence summary of what's happening there, helping readers "
+    "understand which projects/topics are active\n"
+    "2. Follow with a '## Key Highlights' section organized by themes/topics\n"
+    "3. Highlight important discussions, decisions, and announcements\n"
+    "4. Note any questions that were asked but not answered\n"
+    "5. Identify action items or follow-ups mentioned\n"
+    "6. Keep the digest concise but informative\n"
+    "7. Use bullet points and headers for readability\n"
+    "8. Include relevant usernames when attributing specific statements\n"
+    "9. If there are no messages or minimal activity, state that clearly\n\n"
+    "Output format should be clean Markdown suitable for reading."
+)
+
+
+# User-prompt skeleton, parsed once at import. Each call substitutes the
+# five variable fields in a single pass instead of rebuilding the static
+# template text around them.
+_USER_PROMPT_TMPL = Template("""Please create a digest for the Discord server "$server_name".
+
+Time period: $time_range
+Channels with activity: $channel_count
+Total messages: $message_count
+
+Here are the messages organized by channel:
+
+$messages_text
+
+Please create a well-organized digest of this activity.""")
+
+
+# Deletion table for control and format characters: C0 (minus tab), DEL,
+# C1, the Unicode line/paragraph separators, and the invisible Cf
+# characters (zero-width spaces/joiners, bidi overrides and isolates,
+# BOM, tag characters) that isprintable() also rejected - they can hide
+# or reorder text and split keywords past _DANGER_RE. str.translate with
+# a precomputed table runs in C; the previous per-character isprintable()
+# generator was a Python-level pass over the entire prompt text.
+_CONTROL_DELETE_TABLE = dict.fromkeys(
+    (
+        *range(0x00, 0x09),
+        *range(0x0A, 0x20),
+        *range(0x7F, 0xA0),
+        0xAD,  # soft hyphen
+        0x061C,  # Arabic letter mark
+        0x180E,  # Mongolian vowel separator
+        *range(0x200B, 0x2010),  # zero-width space/joiners, directional marks
+        *range(0x2028, 0x202F),  # line/para separators, bidi embeds and overrides
+        *range(0x2060, 0x2065),  # word joiner, invisible operators
+        *range(0x2066, 0x206A),  # bidi isolates
+        0xFEFF,  # byte-order mark / zero-width no-break space
+        *range(0xE0000, 0xE0080),  # tag characters
+    )
+)
+
+# Common prompt-injection phrases, compiled into one alternation so
+# neutralizing them is a single C-level scan instead of a Python loop of
+# `in` checks plus replace() passes per pattern.
+_DANGER_RE = re.compile(
+    r"ignore previous|ignore above|ignore all|disregard previous"
+    r"|new instructions|system:|assistant:|user:",
+    re.IGNORECASE,
+)
+
+
+def _defang(match: re.Match[str]) -> str:
+    """Rewrite an injection phrase so it no longer parses as an instruction."""
+    return match.group(0).replace(" ", "_").replace(":", "_")
 
 
 class LLMError(Exception):
@@ -9,6 +98,143 @@ class LLMError(Exception):
     pass
 
 
+# In-flight async digests keyed by the same prompt hash the response
+# cache uses. Two concurrent callers with identical prompts (same
+# channel, two subscribers) share one provider call instead of both
+# paying for it. Entries only live for the duration of the call.
+_inflight: dict[str, "asyncio.Future[str]"] = {}
+
+
+async def _coalesce(key: str, call: Callable[[], Awaitable[str]]) -> str:
+    """Run an async digest call, deduplicating concurrent identical ones.
+
+    The first caller for a key performs the call; later callers arriving
+    while it is in flight await the same result. Failures propagate to
+    every waiter. Sequential calls are unaffected - the entry is removed
+    as soon as the call settles.
+    """
+    existing = _inflight.get(key)
+    if existing is not None:
+        return await existing
+
+    future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await call()
+    except BaseException as e:
+        future.set_exception(e)
+        # Mark retrieved so a waiter-less future does not warn at GC;
+        # the original exception is re-raised to this caller below.
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+@contextmanager
+def _api_call_tracker(
+    service: str,
+    operation: str,
+    security_logger: SecurityLogger,
+) -> Iterator[None]:
+    """Time an API call and log its outcome as a single api_call event.
+
+    Replaces the duration/log boilerplate that every except branch of the
+    providers used to repeat: one timer, one log call, and the exception
+    (if any) continues to the caller's error mapping unchanged. Uses
+    time.perf_counter, which is monotonic and cheaper than time.time.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        duration_ms = (time.perf_counter() - start) * 1000
+        security_logger.log_api_call(service, operation, duration_ms, False)
+        raise
+    duration_ms = (time.perf_counter() - start) * 1000
+    # One combined call+auth success event instead of two separate ones
+    security_logger.log_api_success(service, operation, duration_ms)
+
+
+# Retry schedule for transient provider errors: exponential backoff with
+# jitter so parallel callers don't resynchronize into the same window.
+_RETRY_BASE_DELAY = 1.0
+_RETRY_DELAY_CAP = 30.0
+_RETRY_JITTER = 1.0
+_MAX_RETRIES = 4
+
+
+def _retry_delay(attempt: int, exc: Exception) -> float:
+    """Return how long to sleep before retrying after a transient error."""
+    delay = min(_RETRY_BASE_DELAY * 2**attempt, _RETRY_DELAY_CAP)
+    delay += random.uniform(0, _RETRY_JITTER)
+    # The provider knows best when capacity frees up; honor Retry-After
+    # when the SDK exposes the HTTP response.
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is not None:
+        retry_after = headers.get("retry-after") or headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                pass
+    return delay
+
+
+def _retryable_create(
+    create: Callable[[], _T],
+    *retryable: type[Exception],
+) -> _T:
+    """Call an API request, retrying transient failures with backoff.
+
+    Rate limits, server errors, and connection drops usually clear within
+    seconds; retrying here saves the caller from re-invoking the whole
+    digest from scratch (and re-paying the input tokens). The last
+    attempt's exception propagates to the caller's normal error mapping.
+
+    Args:
+        create: Zero-argument callable performing the API request.
+        retryable: Exception types worth retrying; anything else raises
+            immediately.
+
+    Returns:
+        The result of the first successful call.
+    """
+    exceptions = tuple(retryable)
+    for attempt in range(_MAX_RETRIES):
+        try:
+            return create()
+        except exceptions as e:
+            if attempt == _MAX_RETRIES - 1:
+                raise
+            time.sleep(_retry_delay(attempt, e))
+    raise AssertionError("unreachable")
+
+
+async def _retryable_create_async(
+    create: Callable[[], Awaitable[_T]],
+    *retryable: type[Exception],
+) -> _T:
+    """Async counterpart of _retryable_create.
+
+    Same schedule and semantics, but sleeps with asyncio.sleep so the
+    fan-out path - where concurrent callers are most likely to trip rate
+    limits - retries without blocking the event loop.
+    """
+    exceptions = tuple(retryable)
+    for attempt in range(_MAX_RETRIES):
+        try:
+            return await create()
+        except exceptions as e:
+            if attempt == _MAX_RETRIES - 1:
+                raise
+            await asyncio.sleep(_retry_delay(attempt, e))
+    raise AssertionError("unreachable")
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers.
 
@@ -59,27 +285,56 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def generate_digest_async(
+        self,
+        messages_text: str,
+        server_name: str,
+        channel_count: int,
+        message_count: int,
+        time_range: str,
+    ) -> str:
+        """Async variant of generate_digest.
+
+        The base implementation runs the sync method in a worker thread so
+        every provider supports concurrent fan-out; providers with a native
+        async SDK client override this to avoid the thread hop.
+        """
+        return await asyncio.to_thread(
+            self.generate_digest,
+            messages_text,
+            server_name,
+            channel_count,
+            message_count,
+            time_range,
+        )
+
+    def generate_digest_stream(
+        self,
+        messages_text: str,
+        server_name: str,
+        channel_count: int,
+        message_count: int,
+        time_range: str,
+    ) -> Iterator[str]:
+        """Yield the digest incrementally as text chunks.
+
+        Streaming lets callers show output as soon as the model produces
+        it instead of waiting for the full response. The base
+        implementation buffers the sync result and yields it as a single
+        chunk; providers with a streaming SDK override this to yield true
+        deltas.
+        """
+        yield self.generate_digest(
+            messages_text,
+            server_name,
+            channel_count,
+            message_count,
+            time_range,
+        )
+
     def _get_system_prompt(self) -> str:
         """Return the system prompt for digest generation."""
-        return (
-            "You are a helpful assistant that creates concise, well-organized "
-            "digests of Discord server conversations.\n\n"
-            "Your task is to analyze the provided Discord messages and create a "
-            "comprehensive yet readable digest in Markdown format.\n\n"
-            "Guidelines:\n"
-            "1. Start with a '## Channel Activity Summary' section that lists each channel "
-            "with a brief 1-2 sentence summary of what's happening there, helping readers "
-            "understand which projects/topics are active\n"
-            "2. Follow with a '## Key Highlights' section organized by themes/topics\n"
-            "3. Highlight important discussions, decisions, and announcements\n"
-            "4. Note any questions that were asked but not answered\n"
-            "5. Identify action items or follow-ups mentioned\n"
-            "6. Keep the digest concise but informative\n"
-            "7. Use bullet points and headers for readability\n"
-            "8. Include relevant usernames when attributing specific statements\n"
-            "9. If there are no messages or minimal activity, state that clearly\n\n"
-            "Output format should be clean Markdown suitable for reading."
-        )
+        return _SYSTEM_PROMPT
 
     def _get_user_prompt(
         self,
@@ -104,17 +359,13 @@ class LLMProvider(ABC):
             truncate_notice = "\n\n[...messages truncated for length...]"
             messages_text = messages_text[:max_message_length] + truncate_notice
 
-        return f"""Please create a digest for the Discord server "{safe_server_name}".
-
-Time period: {safe_time_range}
-Channels with activity: {channel_count}
-Total messages: {message_count}
-
-Here are the messages organized by channel:
-
-{messages_text}
-
-Please create a well-organized digest of this activity."""
+        return _USER_PROMPT_TMPL.substitute(
+            server_name=safe_server_name,
+            time_range=safe_time_range,
+            channel_count=channel_count,
+            message_count=message_count,
+            messages_text=messages_text,
+        )
 
     @staticmethod
     def _sanitize_for_llm(text: str) -> str:
@@ -131,29 +382,12 @@ Please create a well-organized digest of this activity."""
 
         # Remove control characters that could break prompt structure
         sanitized = text.replace("\n", " ").replace("\r", " ")
-        sanitized = "".join(c for c in sanitized if c.isprintable() or c in " \t")
+        sanitized = sanitized.translate(_CONTROL_DELETE_TABLE)
 
         # Limit length to prevent injection attacks
         max_length = 200
         if len(sanitized) > max_length:
             sanitized = sanitized[:max_length]
 
-        # Remove common prompt injection patterns
-        dangerous_patterns = [
-            "ignore previous",
-            "ignore above",
-            "ignore all",
-            "disregard previous",
-            "new instructions",
-            "system:",
-            "assistant:",
-            "user:",
-        ]
-
-        sanitized_lower = sanitized.lower()
-        for pattern in dangerous_patterns:
-            if pattern in sanitized_lower:
-                # Replace the dangerous pattern with a safe version
-                sanitized = sanitized.replace(pattern, pattern.replace(" ", "_"))
-
-        return sanitized
+        # Neutralize common prompt injection patterns in one pass
+        return _DANGER_RE.sub(_defang, sanitized)
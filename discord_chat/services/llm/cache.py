@@ -0,0 +1,190 @@
+"""Exact-match on-disk cache for LLM digest responses.
+
+Repeated digest runs with identical prompts (common in dev/test loops and
+re-runs after output tweaks) otherwise pay a full multi-second LLM round
+trip for a response we already have. This cache keys on a SHA-256 of
+(model, system prompt, user prompt) so any prompt change is a miss, and is
+opt-in via DISCORD_CHAT_LLM_CACHE=1.
+"""
+
+import array
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+
+DEFAULT_TTL_SECONDS = 7 * 86400  # one week
+
+# Cosine similarity above which two prompts are treated as duplicates by
+# the semantic layer. Overlapping hour windows produce prompts well above
+# this; distinct conversations fall well below.
+SEMANTIC_THRESHOLD = 0.92
+_EMBED_DIM = 256
+
+_SCHEMA = """\
+CREATE TABLE IF NOT EXISTS responses (
+    hash TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS embeddings (
+    hash TEXT PRIMARY KEY,
+    server TEXT NOT NULL,
+    embedding BLOB NOT NULL
+);
+"""
+
+
+def cache_enabled() -> bool:
+    """Whether the opt-in response cache is active (DISCORD_CHAT_LLM_CACHE=1)."""
+    return os.environ.get("DISCORD_CHAT_LLM_CACHE") == "1"
+
+
+def semantic_enabled() -> bool:
+    """Whether the fuzzy near-duplicate layer is active.
+
+    Separately opt-in (DISCORD_CHAT_LLM_SEMANTIC=1 on top of the cache
+    gate) because a near-match can return a digest that omits the newest
+    messages; exact-match hits never can.
+    """
+    return cache_enabled() and os.environ.get("DISCORD_CHAT_LLM_SEMANTIC") == "1"
+
+
+def _embed(text: str) -> array.array:
+    """Hashed bag-of-words embedding, L2-normalized.
+
+    Deliberately model-free: crc32-hashed token counts are enough to score
+    the near-total prompt overlap of adjacent hour windows, without pulling
+    an embedding model (and its runtime) into a CLI tool. crc32 is used
+    instead of hash() because the latter is salted per process.
+    """
+    vec = array.array("f", bytes(4 * _EMBED_DIM))
+    for token in text.lower().split():
+        vec[zlib.crc32(token.encode()) % _EMBED_DIM] += 1.0
+    norm = math.sqrt(sum(v * v for v in vec))
+    if norm:
+        for i, value in enumerate(vec):
+            vec[i] = value / norm
+    return vec
+
+
+def _cosine(a: array.array, b: array.array) -> float:
+    """Cosine similarity of two already-normalized vectors."""
+    return sum(x * y for x, y in zip(a, b, strict=True))
+
+
+def cache_key(model: str, system_prompt: str, user_prompt: str) -> str:
+    """Content hash identifying one exact (model, prompts) combination."""
+    payload = json.dumps(
+        {"model": model, "sys": system_prompt, "usr": user_prompt},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMCache:
+    """Small sqlite-backed exact-match response cache."""
+
+    def __init__(self, path: Path | None = None):
+        """Open (or create) the cache database.
+
+        Args:
+            path: Database file location. Defaults to
+                ~/.cache/discord-chat/llm-responses.db
+        """
+        if path is None:
+            path = Path.home() / ".cache" / "discord-chat" / "llm-responses.db"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for a key, or None on miss/expiry."""
+        row = self._conn.execute(
+            "SELECT response, expires_at FROM responses WHERE hash = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        response, expires_at = row
+        if expires_at < time.time():
+            self._conn.execute("DELETE FROM responses WHERE hash = ?", (key,))
+            self._conn.commit()
+            return None
+        return response.decode() if isinstance(response, bytes) else response
+
+    def set(self, key: str, model: str, response: str, ttl: float = DEFAULT_TTL_SECONDS) -> None:
+        """Store a response under a key with the given time-to-live."""
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (key, model, response.encode(), now, now + ttl),
+        )
+        self._conn.commit()
+
+    def get_semantic(
+        self,
+        server: str,
+        user_prompt: str,
+        threshold: float = SEMANTIC_THRESHOLD,
+    ) -> str | None:
+        """Return the response of the most similar unexpired prompt, if any.
+
+        Rows are namespaced by server name so one server's digest can never
+        be served for another, no matter how similar the prompts score.
+        """
+        query = _embed(user_prompt)
+        best_hash: str | None = None
+        best_sim = threshold
+        rows = self._conn.execute(
+            "SELECT e.hash, e.embedding FROM embeddings e"
+            " JOIN responses r ON r.hash = e.hash"
+            " WHERE e.server = ? AND r.expires_at >= ?",
+            (server, time.time()),
+        )
+        for hash_, blob in rows:
+            stored = array.array("f")
+            stored.frombytes(blob)
+            similarity = _cosine(query, stored)
+            if similarity >= best_sim:
+                best_sim = similarity
+                best_hash = hash_
+        if best_hash is None:
+            return None
+        return self.get(best_hash)
+
+    def set_semantic(self, key: str, server: str, user_prompt: str) -> None:
+        """Store the prompt's embedding alongside an already-set response."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+            (key, server, _embed(user_prompt).tobytes()),
+        )
+        self._conn.commit()
+
+
+# Shared cache instance; created lazily so the sqlite file is only touched
+# when the feature is actually enabled.
+_cache: LLMCache | None = None
+
+
+def get_cache() -> LLMCache | None:
+    """Return the shared cache when enabled, else None.
+
+    Any failure opening the database quietly disables caching - it is an
+    optimization, never a correctness requirement.
+    """
+    global _cache
+    if not cache_enabled():
+        return None
+    if _cache is None:
+        try:
+            _cache = LLMCache()
+        except (OSError, sqlite3.Error):
+            return None
+    return _cache
@@ -1,11 +1,58 @@
 """Claude (Anthropic) LLM provider implementation."""
 
+import functools
 import os
-import time
+
+# Imported once at module load instead of inside every generate_digest
+# call; the hot path then checks a module global rather than re-running
+# the import machinery. The None fallback keeps this module importable
+# without the SDK so callers get a clear LLMError at call time.
+try:
+    import anthropic
+    import httpx
+except ImportError:
+    anthropic = None  # type: ignore[assignment]
+    httpx = None  # type: ignore[assignment]
 
 from discord_chat.utils.security_logger import get_security_logger
 
-from .base import LLMError, LLMProvider
+from .base import (
+    LLMError,
+    LLMProvider,
+    _api_call_tracker,
+    _coalesce,
+    _retryable_create,
+    _retryable_create_async,
+)
+from .cache import cache_key, get_cache, semantic_enabled
+from .limiter import get_llm_limiter
+
+
+@functools.cache
+def _get_client(api_key: str):
+    """Return a memoized Anthropic client for an API key.
+
+    Rebuilding the client per digest call discarded the TCP+TLS connection
+    pool each time; reusing it saves the handshake round trips on every
+    call after the first. Keep-alive limits bound the pooled sockets, and
+    verify=True preserves the CRIT-006 TLS guarantee. Sockets are released
+    at process exit.
+    """
+    http_client = httpx.Client(
+        verify=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    )
+    return anthropic.Anthropic(api_key=api_key, http_client=http_client)
+
+
+@functools.cache
+def _get_async_client(api_key: str):
+    """Async counterpart of _get_client, with the same pooling and TLS setup."""
+    http_client = httpx.AsyncClient(
+        verify=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    )
+    return anthropic.AsyncAnthropic(api_key=api_key, http_client=http_client)
 
 
 class ClaudeProvider(LLMProvider):
@@ -36,10 +83,7 @@ class ClaudeProvider(LLMProvider):
         """Generate a digest using Claude."""
         security_logger = get_security_logger()
 
-        try:
-            import anthropic
-            import httpx
-        except ImportError:
+        if anthropic is None or httpx is None:
             raise LLMError(
                 "anthropic and httpx packages required. Run: pip install anthropic httpx"
             )
@@ -49,60 +93,74 @@ class ClaudeProvider(LLMProvider):
             security_logger.log_auth_attempt(False, "Claude", "API key not found")
             raise LLMError(f"API key not found. Set {self.required_env_var} environment variable.")
 
-        # CRIT-006 fix: Ensure TLS certificate verification is enabled
-        # Create client with explicit TLS verification
-        http_client = httpx.Client(verify=True)
-        client = anthropic.Anthropic(api_key=api_key, http_client=http_client)
-        start_time = time.time()
+        system_prompt = self._get_system_prompt()
+        user_prompt = self._get_user_prompt(
+            messages_text,
+            server_name,
+            channel_count,
+            message_count,
+            time_range,
+        )
+
+        # Opt-in exact-match response cache (DISCORD_CHAT_LLM_CACHE=1):
+        # identical prompts short-circuit before any client construction.
+        cache = get_cache()
+        key = cache_key(self.MODEL, system_prompt, user_prompt) if cache is not None else ""
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            # Fuzzy layer: overlapping hour windows produce near-identical
+            # prompts that the exact hash misses
+            if semantic_enabled():
+                cached = cache.get_semantic(server_name, user_prompt)
+                if cached is not None:
+                    return cached
+
+        # Memoized per API key; TLS verification is enforced in the factory
+        client = _get_client(api_key)
 
         try:
-            response = client.messages.create(
-                model=self.MODEL,
-                max_tokens=self.MAX_TOKENS,
-                system=self._get_system_prompt(),
-                messages=[
-                    {
-                        "role": "user",
-                        "content": self._get_user_prompt(
-                            messages_text,
-                            server_name,
-                            channel_count,
-                            message_count,
-                            time_range,
-                        ),
-                    }
-                ],
-            )
+            # The tracker times the call and logs the api_call outcome;
+            # transient failures (rate limit, server error, dropped
+            # connection) are retried with backoff before the except
+            # ladder below turns them into a hard LLMError.
+            with _api_call_tracker("Claude", "generate_digest", security_logger):
+                response = _retryable_create(
+                    lambda: client.messages.create(
+                        model=self.MODEL,
+                        max_tokens=self.MAX_TOKENS,
+                        system=system_prompt,
+                        messages=[{"role": "user", "content": user_prompt}],
+                    ),
+                    anthropic.RateLimitError,
+                    anthropic.InternalServerError,
+                    anthropic.APIConnectionError,
+                )
 
-            # Extract text from response
-            if response.content and len(response.content) > 0:
-                duration_ms = (time.time() - start_time) * 1000
-                security_logger.log_api_call("Claude", "generate_digest", duration_ms, True)
-                security_logger.log_auth_attempt(True, "Claude")
-                return response.content[0].text
+                # Extract text from response
+                if not response.content or len(response.content) == 0:
+                    raise LLMError("Empty response from Claude API")
+                text = response.content[0].text
 
-            raise LLMError("Empty response from Claude API")
+            if cache is not None:
+                cache.set(key, self.MODEL, text)
+                if semantic_enabled():
+                    cache.set_semantic(key, server_name, user_prompt)
+            return text
 
         except anthropic.AuthenticationError:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("Claude", "generate_digest", duration_ms, False)
             security_logger.log_auth_attempt(False, "Claude", "Invalid API key")
             raise LLMError(
                 "Claude authentication failed. Please verify your ANTHROPIC_API_KEY is valid."
             )
         except anthropic.RateLimitError:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("Claude", "generate_digest", duration_ms, False)
             security_logger.log_error("rate_limit", "Claude API rate limit exceeded", {})
             raise LLMError("Claude API rate limit exceeded. Please wait a moment and try again.")
         except anthropic.APIConnectionError:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("Claude", "generate_digest", duration_ms, False)
             security_logger.log_error("connection", "Failed to connect to Claude API", {})
             raise LLMError("Unable to connect to Claude API. Please check your network connection.")
         except anthropic.BadRequestError as e:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("Claude", "generate_digest", duration_ms, False)
             security_logger.log_error("bad_request", "Invalid request to Claude API", {})
             # Check for content-related errors (too long, etc.)
             error_str = str(e).lower()
@@ -113,23 +171,225 @@ class ClaudeProvider(LLMProvider):
                 )
             raise LLMError("Invalid request to Claude API. Please try again.")
         except anthropic.InternalServerError:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("Claude", "generate_digest", duration_ms, False)
             security_logger.log_error("server_error", "Claude API server error", {})
             raise LLMError("Claude API is experiencing issues. Please try again in a few minutes.")
         except anthropic.APIError as e:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("Claude", "generate_digest", duration_ms, False)
             if hasattr(e, "status_code") and e.status_code in (401, 403):
                 security_logger.log_auth_attempt(False, "Claude", f"API error {e.status_code}")
             status = getattr(e, "status_code", "unknown")
             security_logger.log_error("api_error", f"Claude API error (status: {status})", {})
             raise LLMError("Claude API error occurred. Please try again.")
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("Claude", "generate_digest", duration_ms, False)
             security_logger.log_error("unknown", f"Unexpected error: {type(e).__name__}", {})
             raise LLMError(
                 "Failed to generate digest with Claude. "
                 "Please verify your API key and network connection."
             )
+
+    def generate_digest_stream(
+        self,
+        messages_text: str,
+        server_name: str,
+        channel_count: int,
+        message_count: int,
+        time_range: str,
+    ):
+        """Yield the digest as text deltas from Claude's streaming API.
+
+        Time-to-first-chunk is roughly the model's prefill latency
+        instead of the full generation time; the complete text is still
+        cached once the stream finishes. Error mapping mirrors
+        generate_digest.
+        """
+        security_logger = get_security_logger()
+
+        if anthropic is None or httpx is None:
+            raise LLMError(
+                "anthropic and httpx packages required. Run: pip install anthropic httpx"
+            )
+
+        api_key = os.environ.get(self.required_env_var)
+        if not api_key:
+            security_logger.log_auth_attempt(False, "Claude", "API key not found")
+            raise LLMError(f"API key not found. Set {self.required_env_var} environment variable.")
+
+        system_prompt = self._get_system_prompt()
+        user_prompt = self._get_user_prompt(
+            messages_text,
+            server_name,
+            channel_count,
+            message_count,
+            time_range,
+        )
+
+        cache = get_cache()
+        key = cache_key(self.MODEL, system_prompt, user_prompt) if cache is not None else ""
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        client = _get_client(api_key)
+
+        try:
+            with _api_call_tracker("Claude", "generate_digest", security_logger):
+                chunks: list[str] = []
+                with client.messages.stream(
+                    model=self.MODEL,
+                    max_tokens=self.MAX_TOKENS,
+                    system=system_prompt,
+                    messages=[{"role": "user", "content": user_prompt}],
+                ) as stream:
+                    for text in stream.text_stream:
+                        chunks.append(text)
+                        yield text
+
+                if not chunks:
+                    raise LLMError("Empty response from Claude API")
+
+            if cache is not None:
+                cache.set(key, self.MODEL, "".join(chunks))
+                if semantic_enabled():
+                    cache.set_semantic(key, server_name, user_prompt)
+
+        except anthropic.AuthenticationError:
+            security_logger.log_auth_attempt(False, "Claude", "Invalid API key")
+            raise LLMError(
+                "Claude authentication failed. Please verify your ANTHROPIC_API_KEY is valid."
+            )
+        except anthropic.RateLimitError:
+            security_logger.log_error("rate_limit", "Claude API rate limit exceeded", {})
+            raise LLMError("Claude API rate limit exceeded. Please wait a moment and try again.")
+        except anthropic.APIConnectionError:
+            security_logger.log_error("connection", "Failed to connect to Claude API", {})
+            raise LLMError("Unable to connect to Claude API. Please check your network connection.")
+        except anthropic.APIError as e:
+            status = getattr(e, "status_code", "unknown")
+            security_logger.log_error("api_error", f"Claude API error (status: {status})", {})
+            raise LLMError("Claude API error occurred. Please try again.")
+        except Exception as e:
+            security_logger.log_error("unknown", f"Unexpected error: {type(e).__name__}", {})
+            raise LLMError(
+                "Failed to generate digest with Claude. "
+                "Please verify your API key and network connection."
+            )
+
+    async def generate_digest_async(
+        self,
+        messages_text: str,
+        server_name: str,
+        channel_count: int,
+        message_count: int,
+        time_range: str,
+    ) -> str:
+        """Generate a digest using Claude's async client.
+
+        Overrides the thread-hop fallback in LLMProvider with a native
+        AsyncAnthropic call, so fanned-out digests multiplex on one event
+        loop instead of blocking a worker thread each. Caching and error
+        mapping mirror the sync path.
+        """
+        security_logger = get_security_logger()
+
+        if anthropic is None or httpx is None:
+            raise LLMError(
+                "anthropic and httpx packages required. Run: pip install anthropic httpx"
+            )
+
+        api_key = os.environ.get(self.required_env_var)
+        if not api_key:
+            security_logger.log_auth_attempt(False, "Claude", "API key not found")
+            raise LLMError(f"API key not found. Set {self.required_env_var} environment variable.")
+
+        system_prompt = self._get_system_prompt()
+        user_prompt = self._get_user_prompt(
+            messages_text,
+            server_name,
+            channel_count,
+            message_count,
+            time_range,
+        )
+
+        cache = get_cache()
+        # Always computed: the hash doubles as the request-coalescing key
+        key = cache_key(self.MODEL, system_prompt, user_prompt)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            if semantic_enabled():
+                cached = cache.get_semantic(server_name, user_prompt)
+                if cached is not None:
+                    return cached
+
+        client = _get_async_client(api_key)
+
+        async def _call() -> str:
+            try:
+                # Client-side limit: queue here rather than trip the API's
+                # rate limiter and pay for a rejected request. Transient
+                # failures retry with the same backoff as the sync path.
+                with _api_call_tracker("Claude", "generate_digest", security_logger):
+                    async with get_llm_limiter():
+                        response = await _retryable_create_async(
+                            lambda: client.messages.create(
+                                model=self.MODEL,
+                                max_tokens=self.MAX_TOKENS,
+                                system=system_prompt,
+                                messages=[{"role": "user", "content": user_prompt}],
+                            ),
+                            anthropic.RateLimitError,
+                            anthropic.InternalServerError,
+                            anthropic.APIConnectionError,
+                        )
+
+                    if not response.content or len(response.content) == 0:
+                        raise LLMError("Empty response from Claude API")
+                    text = response.content[0].text
+
+                if cache is not None:
+                    cache.set(key, self.MODEL, text)
+                    if semantic_enabled():
+                        cache.set_semantic(key, server_name, user_prompt)
+                return text
+
+            except anthropic.AuthenticationError:
+                security_logger.log_auth_attempt(False, "Claude", "Invalid API key")
+                raise LLMError(
+                    "Claude authentication failed. Please verify your ANTHROPIC_API_KEY is valid."
+                )
+            except anthropic.RateLimitError:
+                security_logger.log_error("rate_limit", "Claude API rate limit exceeded", {})
+                raise LLMError(
+                    "Claude API rate limit exceeded. Please wait a moment and try again."
+                )
+            except anthropic.APIConnectionError:
+                security_logger.log_error("connection", "Failed to connect to Claude API", {})
+                raise LLMError(
+                    "Unable to connect to Claude API. Please check your network connection."
+                )
+            except anthropic.BadRequestError as e:
+                security_logger.log_error("bad_request", "Invalid request to Claude API", {})
+                error_str = str(e).lower()
+                if "token" in error_str or "length" in error_str or "too long" in error_str:
+                    raise LLMError(
+                        "Message content too long for Claude API. "
+                        "Try reducing the time range with --hours."
+                    )
+                raise LLMError("Invalid request to Claude API. Please try again.")
+            except anthropic.APIError as e:
+                if hasattr(e, "status_code") and e.status_code in (401, 403):
+                    security_logger.log_auth_attempt(False, "Claude", f"API error {e.status_code}")
+                status = getattr(e, "status_code", "unknown")
+                security_logger.log_error("api_error", f"Claude API error (status: {status})", {})
+                raise LLMError("Claude API error occurred. Please try again.")
+            except Exception as e:
+                security_logger.log_error("unknown", f"Unexpected error: {type(e).__name__}", {})
+                raise LLMError(
+                    "Failed to generate digest with Claude. "
+                    "Please verify your API key and network connection."
+                )
+
+        # Concurrent identical requests share a single in-flight call
+        return await _coalesce(key, _call)
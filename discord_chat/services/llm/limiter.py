@@ -0,0 +1,133 @@
+"""Client-side rate limiting for LLM API calls.
+
+Batch callers (one digest per channel, provider fan-out) would otherwise
+fire unbounded parallel requests and hit the providers' server-side
+limits, paying for the rejected request plus the RateLimitError handling
+on every overshoot. A semaphore bounds in-flight calls and a token
+bucket smooths request rate, so bursts queue client-side instead of
+bouncing off the API.
+"""
+
+import asyncio
+import os
+import weakref
+
+from discord_chat.utils.security_logger import get_security_logger
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_RPM = 100
+
+
+def _get_env_int(name: str, default: int, min_val: int, max_val: int) -> int:
+    """Get an integer from environment with validation.
+
+    Args:
+        name: Environment variable name.
+        default: Default value if not set.
+        min_val: Minimum allowed value.
+        max_val: Maximum allowed value.
+
+    Returns:
+        Validated integer value.
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        int_val = int(value)
+        if int_val < min_val or int_val > max_val:
+            return default
+        return int_val
+    except ValueError:
+        return default
+
+
+class TokenBucket:
+    """Token bucket granting one token per request, refilled continuously.
+
+    Tokens accrue at rate_per_sec up to burst; an acquire that finds the
+    bucket empty sleeps just long enough for the next token instead of
+    spinning. Single-loop use only, like the rest of this module.
+    """
+
+    __slots__ = ("rate_per_sec", "burst", "tokens", "updated")
+
+    def __init__(self, rate_per_sec: float, burst: int):
+        self.rate_per_sec = rate_per_sec
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = 0.0
+
+    def _refill(self, now: float) -> None:
+        if self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate_per_sec)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until the bucket can supply it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            self._refill(loop.time())
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self.tokens) / self.rate_per_sec)
+
+
+class LLMRateLimiter:
+    """Semaphore + token bucket wrapped as an async context manager.
+
+    Usage: ``async with get_llm_limiter():`` around the provider's
+    ``.create`` call. The semaphore caps concurrent in-flight requests;
+    the bucket caps sustained requests per minute.
+    """
+
+    __slots__ = ("max_concurrency", "semaphore", "bucket")
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int):
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst=max_concurrency)
+
+    async def __aenter__(self) -> "LLMRateLimiter":
+        # Only an actual wait is an enforcement event worth logging;
+        # uncontended passes stay off the security log.
+        if self.semaphore.locked() or self.bucket.tokens < 1.0:
+            get_security_logger().log_rate_limit("LLM", self.max_concurrency)
+        await self.semaphore.acquire()
+        try:
+            await self.bucket.acquire()
+        except BaseException:
+            # Cancellation between the two acquires would otherwise leak
+            # the semaphore slot for good: __aexit__ never runs when
+            # __aenter__ raises.
+            self.semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.semaphore.release()
+
+
+# One limiter per event loop: a Semaphore is bound to the loop it was
+# created under, and sharing one instance across a loop's tasks is what
+# makes the bound global rather than per-caller. Weak keys let finished
+# loops (e.g. per-test loops) drop their entries.
+_loop_limiters: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_llm_limiter() -> LLMRateLimiter:
+    """Return the shared rate limiter for the running event loop.
+
+    Limits come from DISCORD_CHAT_LLM_MAX_CONCURRENCY and
+    DISCORD_CHAT_LLM_RPM, read when the loop's limiter is first built.
+    """
+    loop = asyncio.get_running_loop()
+    limiter = _loop_limiters.get(loop)
+    if limiter is None:
+        limiter = LLMRateLimiter(
+            _get_env_int("DISCORD_CHAT_LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY, 1, 100),
+            _get_env_int("DISCORD_CHAT_LLM_RPM", DEFAULT_RPM, 1, 10000),
+        )
+        _loop_limiters[loop] = limiter
+    return limiter
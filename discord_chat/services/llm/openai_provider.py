@@ -1,11 +1,58 @@
 """OpenAI LLM provider implementation."""
 
+import functools
 import os
-import time
+
+# Imported once at module load instead of inside every generate_digest
+# call; the hot path then checks a module global rather than re-running
+# the import machinery. The None fallback keeps this module importable
+# without the SDK so callers get a clear LLMError at call time.
+try:
+    import httpx
+    import openai
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+    openai = None  # type: ignore[assignment]
 
 from discord_chat.utils.security_logger import get_security_logger
 
-from .base import LLMError, LLMProvider
+from .base import (
+    LLMError,
+    LLMProvider,
+    _api_call_tracker,
+    _coalesce,
+    _retryable_create,
+    _retryable_create_async,
+)
+from .cache import cache_key, get_cache, semantic_enabled
+from .limiter import get_llm_limiter
+
+
+@functools.cache
+def _get_client(api_key: str):
+    """Return a memoized OpenAI client for an API key.
+
+    Rebuilding the client per digest call discarded the TCP+TLS connection
+    pool each time; reusing it saves the handshake round trips on every
+    call after the first. Keep-alive limits bound the pooled sockets, and
+    verify=True preserves the CRIT-006 TLS guarantee. Sockets are released
+    at process exit.
+    """
+    http_client = httpx.Client(
+        verify=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    )
+    return openai.OpenAI(api_key=api_key, http_client=http_client)
+
+
+@functools.cache
+def _get_async_client(api_key: str):
+    """Async counterpart of _get_client, with the same pooling and TLS setup."""
+    http_client = httpx.AsyncClient(
+        verify=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    )
+    return openai.AsyncOpenAI(api_key=api_key, http_client=http_client)
 
 
 class OpenAIProvider(LLMProvider):
@@ -36,10 +83,7 @@ class OpenAIProvider(LLMProvider):
         """Generate a digest using OpenAI."""
         security_logger = get_security_logger()
 
-        try:
-            import httpx
-            import openai
-        except ImportError:
+        if openai is None or httpx is None:
             raise LLMError("openai and httpx packages required. Run: pip install openai httpx")
 
         api_key = os.environ.get(self.required_env_var)
@@ -47,62 +91,78 @@ class OpenAIProvider(LLMProvider):
             security_logger.log_auth_attempt(False, "OpenAI", "API key not found")
             raise LLMError(f"API key not found. Set {self.required_env_var} environment variable.")
 
-        # CRIT-006 fix: Ensure TLS certificate verification is enabled
-        # Create client with explicit TLS verification
-        http_client = httpx.Client(verify=True)
-        client = openai.OpenAI(api_key=api_key, http_client=http_client)
-        start_time = time.time()
+        system_prompt = self._get_system_prompt()
+        user_prompt = self._get_user_prompt(
+            messages_text,
+            server_name,
+            channel_count,
+            message_count,
+            time_range,
+        )
+
+        # Opt-in exact-match response cache (DISCORD_CHAT_LLM_CACHE=1):
+        # identical prompts short-circuit before any client construction.
+        cache = get_cache()
+        key = cache_key(self.MODEL, system_prompt, user_prompt) if cache is not None else ""
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            # Fuzzy layer: overlapping hour windows produce near-identical
+            # prompts that the exact hash misses
+            if semantic_enabled():
+                cached = cache.get_semantic(server_name, user_prompt)
+                if cached is not None:
+                    return cached
+
+        # Memoized per API key; TLS verification is enforced in the factory
+        client = _get_client(api_key)
 
         try:
-            response = client.chat.completions.create(
-                model=self.MODEL,
-                max_tokens=self.MAX_TOKENS,
-                messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
-                    {
-                        "role": "user",
-                        "content": self._get_user_prompt(
-                            messages_text,
-                            server_name,
-                            channel_count,
-                            message_count,
-                            time_range,
-                        ),
-                    },
-                ],
-            )
+            # The tracker times the call and logs the api_call outcome;
+            # transient failures (rate limit, server error, dropped
+            # connection) are retried with backoff before the except
+            # ladder below turns them into a hard LLMError.
+            with _api_call_tracker("OpenAI", "generate_digest", security_logger):
+                response = _retryable_create(
+                    lambda: client.chat.completions.create(
+                        model=self.MODEL,
+                        max_tokens=self.MAX_TOKENS,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                    ),
+                    openai.RateLimitError,
+                    openai.InternalServerError,
+                    openai.APIConnectionError,
+                )
 
-            # Extract text from response
-            if response.choices and len(response.choices) > 0:
-                content = response.choices[0].message.content
-                if content:
-                    duration_ms = (time.time() - start_time) * 1000
-                    security_logger.log_api_call("OpenAI", "generate_digest", duration_ms, True)
-                    security_logger.log_auth_attempt(True, "OpenAI")
-                    return content
+                # Extract text from response
+                content = None
+                if response.choices and len(response.choices) > 0:
+                    content = response.choices[0].message.content
+                if not content:
+                    raise LLMError("Empty response from OpenAI API")
 
-            raise LLMError("Empty response from OpenAI API")
+            if cache is not None:
+                cache.set(key, self.MODEL, content)
+                if semantic_enabled():
+                    cache.set_semantic(key, server_name, user_prompt)
+            return content
 
         except openai.AuthenticationError:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("OpenAI", "generate_digest", duration_ms, False)
             security_logger.log_auth_attempt(False, "OpenAI", "Invalid API key")
             raise LLMError(
                 "OpenAI authentication failed. Please verify your OPENAI_API_KEY is valid."
             )
         except openai.RateLimitError:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("OpenAI", "generate_digest", duration_ms, False)
             security_logger.log_error("rate_limit", "OpenAI API rate limit exceeded", {})
             raise LLMError("OpenAI API rate limit exceeded. Please wait a moment and try again.")
         except openai.APIConnectionError:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("OpenAI", "generate_digest", duration_ms, False)
             security_logger.log_error("connection", "Failed to connect to OpenAI API", {})
             raise LLMError("Unable to connect to OpenAI API. Please check your network connection.")
         except openai.BadRequestError as e:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("OpenAI", "generate_digest", duration_ms, False)
             security_logger.log_error("bad_request", "Invalid request to OpenAI API", {})
             error_str = str(e).lower()
             if "token" in error_str or "length" in error_str or "too long" in error_str:
@@ -112,23 +172,230 @@ class OpenAIProvider(LLMProvider):
                 )
             raise LLMError("Invalid request to OpenAI API. Please try again.")
         except openai.InternalServerError:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("OpenAI", "generate_digest", duration_ms, False)
             security_logger.log_error("server_error", "OpenAI API server error", {})
             raise LLMError("OpenAI API is experiencing issues. Please try again in a few minutes.")
         except openai.APIError as e:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("OpenAI", "generate_digest", duration_ms, False)
             if hasattr(e, "status_code") and e.status_code in (401, 403):
                 security_logger.log_auth_attempt(False, "OpenAI", f"API error {e.status_code}")
             status = getattr(e, "status_code", "unknown")
             security_logger.log_error("api_error", f"OpenAI API error (status: {status})", {})
             raise LLMError("OpenAI API error occurred. Please try again.")
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
-            security_logger.log_api_call("OpenAI", "generate_digest", duration_ms, False)
             security_logger.log_error("unknown", f"Unexpected error: {type(e).__name__}", {})
             raise LLMError(
                 "Failed to generate digest with OpenAI. "
                 "Please verify your API key and network connection."
             )
+
+    def generate_digest_stream(
+        self,
+        messages_text: str,
+        server_name: str,
+        channel_count: int,
+        message_count: int,
+        time_range: str,
+    ):
+        """Yield the digest as text deltas from OpenAI's streaming API.
+
+        Time-to-first-chunk is roughly the model's prefill latency
+        instead of the full generation time; the complete text is still
+        cached once the stream finishes. Error mapping mirrors
+        generate_digest.
+        """
+        security_logger = get_security_logger()
+
+        if openai is None or httpx is None:
+            raise LLMError("openai and httpx packages required. Run: pip install openai httpx")
+
+        api_key = os.environ.get(self.required_env_var)
+        if not api_key:
+            security_logger.log_auth_attempt(False, "OpenAI", "API key not found")
+            raise LLMError(f"API key not found. Set {self.required_env_var} environment variable.")
+
+        system_prompt = self._get_system_prompt()
+        user_prompt = self._get_user_prompt(
+            messages_text,
+            server_name,
+            channel_count,
+            message_count,
+            time_range,
+        )
+
+        cache = get_cache()
+        key = cache_key(self.MODEL, system_prompt, user_prompt) if cache is not None else ""
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        client = _get_client(api_key)
+
+        try:
+            with _api_call_tracker("OpenAI", "generate_digest", security_logger):
+                chunks: list[str] = []
+                stream = client.chat.completions.create(
+                    model=self.MODEL,
+                    max_tokens=self.MAX_TOKENS,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    stream=True,
+                )
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        text = chunk.choices[0].delta.content
+                        chunks.append(text)
+                        yield text
+
+                if not chunks:
+                    raise LLMError("Empty response from OpenAI API")
+
+            if cache is not None:
+                cache.set(key, self.MODEL, "".join(chunks))
+                if semantic_enabled():
+                    cache.set_semantic(key, server_name, user_prompt)
+
+        except openai.AuthenticationError:
+            security_logger.log_auth_attempt(False, "OpenAI", "Invalid API key")
+            raise LLMError(
+                "OpenAI authentication failed. Please verify your OPENAI_API_KEY is valid."
+            )
+        except openai.RateLimitError:
+            security_logger.log_error("rate_limit", "OpenAI API rate limit exceeded", {})
+            raise LLMError("OpenAI API rate limit exceeded. Please wait a moment and try again.")
+        except openai.APIConnectionError:
+            security_logger.log_error("connection", "Failed to connect to OpenAI API", {})
+            raise LLMError("Unable to connect to OpenAI API. Please check your network connection.")
+        except openai.APIError as e:
+            status = getattr(e, "status_code", "unknown")
+            security_logger.log_error("api_error", f"OpenAI API error (status: {status})", {})
+            raise LLMError("OpenAI API error occurred. Please try again.")
+        except Exception as e:
+            security_logger.log_error("unknown", f"Unexpected error: {type(e).__name__}", {})
+            raise LLMError(
+                "Failed to generate digest with OpenAI. "
+                "Please verify your API key and network connection."
+            )
+
+    async def generate_digest_async(
+        self,
+        messages_text: str,
+        server_name: str,
+        channel_count: int,
+        message_count: int,
+        time_range: str,
+    ) -> str:
+        """Generate a digest using OpenAI's async client.
+
+        Overrides the thread-hop fallback in LLMProvider with a native
+        AsyncOpenAI call, so fanned-out digests multiplex on one event
+        loop instead of blocking a worker thread each. Caching and error
+        mapping mirror the sync path.
+        """
+        security_logger = get_security_logger()
+
+        if openai is None or httpx is None:
+            raise LLMError("openai and httpx packages required. Run: pip install openai httpx")
+
+        api_key = os.environ.get(self.required_env_var)
+        if not api_key:
+            security_logger.log_auth_attempt(False, "OpenAI", "API key not found")
+            raise LLMError(f"API key not found. Set {self.required_env_var} environment variable.")
+
+        system_prompt = self._get_system_prompt()
+        user_prompt = self._get_user_prompt(
+            messages_text,
+            server_name,
+            channel_count,
+            message_count,
+            time_range,
+        )
+
+        cache = get_cache()
+        # Always computed: the hash doubles as the request-coalescing key
+        key = cache_key(self.MODEL, system_prompt, user_prompt)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            if semantic_enabled():
+                cached = cache.get_semantic(server_name, user_prompt)
+                if cached is not None:
+                    return cached
+
+        client = _get_async_client(api_key)
+
+        async def _call() -> str:
+            try:
+                # Client-side limit: queue here rather than trip the API's
+                # rate limiter and pay for a rejected request. Transient
+                # failures retry with the same backoff as the sync path.
+                with _api_call_tracker("OpenAI", "generate_digest", security_logger):
+                    async with get_llm_limiter():
+                        response = await _retryable_create_async(
+                            lambda: client.chat.completions.create(
+                                model=self.MODEL,
+                                max_tokens=self.MAX_TOKENS,
+                                messages=[
+                                    {"role": "system", "content": system_prompt},
+                                    {"role": "user", "content": user_prompt},
+                                ],
+                            ),
+                            openai.RateLimitError,
+                            openai.InternalServerError,
+                            openai.APIConnectionError,
+                        )
+
+                    content = None
+                    if response.choices and len(response.choices) > 0:
+                        content = response.choices[0].message.content
+                    if not content:
+                        raise LLMError("Empty response from OpenAI API")
+
+                if cache is not None:
+                    cache.set(key, self.MODEL, content)
+                    if semantic_enabled():
+                        cache.set_semantic(key, server_name, user_prompt)
+                return content
+
+            except openai.AuthenticationError:
+                security_logger.log_auth_attempt(False, "OpenAI", "Invalid API key")
+                raise LLMError(
+                    "OpenAI authentication failed. Please verify your OPENAI_API_KEY is valid."
+                )
+            except openai.RateLimitError:
+                security_logger.log_error("rate_limit", "OpenAI API rate limit exceeded", {})
+                raise LLMError(
+                    "OpenAI API rate limit exceeded. Please wait a moment and try again."
+                )
+            except openai.APIConnectionError:
+                security_logger.log_error("connection", "Failed to connect to OpenAI API", {})
+                raise LLMError(
+                    "Unable to connect to OpenAI API. Please check your network connection."
+                )
+            except openai.BadRequestError as e:
+                security_logger.log_error("bad_request", "Invalid request to OpenAI API", {})
+                error_str = str(e).lower()
+                if "token" in error_str or "length" in error_str or "too long" in error_str:
+                    raise LLMError(
+                        "Message content too long for OpenAI API. "
+                        "Try reducing the time range with --hours."
+                    )
+                raise LLMError("Invalid request to OpenAI API. Please try again.")
+            except openai.APIError as e:
+                if hasattr(e, "status_code") and e.status_code in (401, 403):
+                    security_logger.log_auth_attempt(False, "OpenAI", f"API error {e.status_code}")
+                status = getattr(e, "status_code", "unknown")
+                security_logger.log_error("api_error", f"OpenAI API error (status: {status})", {})
+                raise LLMError("OpenAI API error occurred. Please try again.")
+            except Exception as e:
+                security_logger.log_error("unknown", f"Unexpected error: {type(e).__name__}", {})
+                raise LLMError(
+                    "Failed to generate digest with OpenAI. "
+                    "Please verify your API key and network connection."
+                )
+
+        # Concurrent identical requests share a single in-flight call
+        return await _coalesce(key, _call)
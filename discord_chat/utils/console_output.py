@@ -2,16 +2,31 @@
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Iterable
+
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 
 # Re-export Console for type annotations
-__all__ = ["Console", "create_console", "render_digest_to_console"]
+__all__ = [
+    "Console",
+    "create_console",
+    "render_digest_to_console",
+    "render_digest_stream_to_console",
+]
 
 
+@functools.lru_cache(maxsize=4)
 def create_console(force_terminal: bool | None = None, no_color: bool = False) -> Console:
-    """Create a Rich console instance.
+    """Create a Rich console instance (memoized per flag combination).
+
+    Console construction probes the terminal (isatty, width, color support),
+    so repeated calls with the same flags return one shared instance. This is
+    safe because Console resolves sys.stdout dynamically when no file is
+    passed, so output redirection still works.
 
     Args:
         force_terminal: Force terminal mode (for testing). None for auto-detect.
@@ -45,12 +60,51 @@ def render_digest_to_console(
     if console is None:
         console = create_console()
 
-    # Render markdown content in a styled panel
-    md = Markdown(digest_content)
-    panel = Panel(
-        md,
+    console.print(_digest_panel(digest_content))
+
+
+def render_digest_stream_to_console(
+    chunks: Iterable[str],
+    console: Console | None = None,
+    quiet: bool = False,
+) -> str:
+    """Render a streaming digest incrementally as chunks arrive.
+
+    Output appears as soon as the LLM starts producing text instead of
+    after the full response. Markdown is only re-parsed when a chunk
+    completes a paragraph (contains a blank line), so parse cost is
+    amortized against the network wait rather than paid per delta.
+
+    Args:
+        chunks: Iterable of markdown text fragments, e.g. from a
+            provider's generate_digest_stream.
+        console: Optional Console instance (for testing). Creates new if None.
+        quiet: If True, consume the stream without rendering.
+
+    Returns:
+        The fully accumulated digest text.
+    """
+    if quiet:
+        return "".join(chunks)
+
+    if console is None:
+        console = create_console()
+
+    buffer = ""
+    with Live(_digest_panel(""), console=console, refresh_per_second=8) as live:
+        for chunk in chunks:
+            buffer += chunk
+            if "\n\n" in chunk:
+                live.update(_digest_panel(buffer))
+        live.update(_digest_panel(buffer))
+    return buffer
+
+
+def _digest_panel(digest_content: str) -> Panel:
+    """Wrap markdown digest content in the standard styled panel."""
+    return Panel(
+        Markdown(digest_content),
         title="Discord Digest",
         border_style="blue",
         padding=(1, 2),
     )
-    console.print(panel)
@@ -1,8 +1,20 @@
 """Formatter utilities for digest generation."""
 
-from datetime import datetime
+from __future__ import annotations
 
-from discord_chat.services.discord_client import ServerDigestData
+import functools
+import re
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from discord_chat.services.discord_client import ServerDigestData
+
+# Validation tables, compiled once at import so the per-call work in
+# validate_server_name is a couple of C-level scans.
+_CONTROL_CHARS_RE = re.compile(r"[\x00\n\r]")
+_PATH_PREFIXES = ("/", "\\")
 
 
 class InvalidServerNameError(ValueError):
@@ -11,9 +23,13 @@ class InvalidServerNameError(ValueError):
     pass
 
 
+@functools.lru_cache(maxsize=64)
 def validate_server_name(server_name: str) -> str:
     """Validate and sanitize server name to prevent path traversal attacks.
 
+    Pure function of its argument, so results are memoized; the digest flow
+    validates the same name several times per invocation.
+
     Args:
         server_name: Raw server name from user input.
 
@@ -30,13 +46,13 @@ def validate_server_name(server_name: str) -> str:
     name = server_name.strip()
 
     # Block path traversal patterns
-    if ".." in name or name.startswith("/") or name.startswith("\\"):
+    if ".." in name or name.startswith(_PATH_PREFIXES):
         raise InvalidServerNameError(
             f"Invalid server name '{server_name}': contains path traversal characters"
         )
 
     # Block null bytes and other dangerous characters
-    if "\x00" in name or "\n" in name or "\r" in name:
+    if _CONTROL_CHARS_RE.search(name):
         raise InvalidServerNameError(
             f"Invalid server name '{server_name}': contains control characters"
         )
@@ -50,39 +66,57 @@ def validate_server_name(server_name: str) -> str:
     return name
 
 
-def format_messages_for_llm(data: ServerDigestData) -> str:
-    """Format Discord messages into text for LLM consumption.
+def iter_messages_for_llm(data: ServerDigestData) -> Iterator[str]:
+    """Yield the LLM prompt text for a digest, one line at a time.
+
+    Streaming counterpart of format_messages_for_llm: consumers that can
+    take chunks (file writers, future streaming providers) avoid holding
+    the whole prompt in memory.
 
     Args:
         data: Server digest data containing all messages.
 
-    Returns:
-        Formatted text string with messages organized by channel.
+    Yields:
+        Lines of formatted text, organized by channel.
     """
     if not data.channels:
-        return "No messages found in the specified time period."
+        yield "No messages found in the specified time period."
+        return
 
-    lines = []
     for channel in data.channels:
-        lines.append(f"## #{channel.channel_name}")
-        lines.append("")
+        yield f"## #{channel.channel_name}"
+        yield ""
 
         for msg in channel.messages:
-            timestamp = msg["timestamp"][:16].replace("T", " ")  # Trim to minute precision
-            author = msg["author"]
-            content = msg["content"]
-
-            # Format the message
-            lines.append(f"[{timestamp}] **{author}**: {content}")
+            # Prefer the line pre-rendered at fetch time; fall back to
+            # formatting from the fields for messages built without one.
+            if msg.line:
+                yield msg.line
+            else:
+                # Render the epoch-microsecond timestamp at minute precision
+                timestamp = datetime.fromtimestamp(msg.timestamp_us / 1e6, UTC).strftime(
+                    "%Y-%m-%d %H:%M"
+                )
+                yield f"[{timestamp}] **{msg.author}**: {msg.content}"
 
             # Note attachments if any
-            if msg["attachments"]:
-                attachments = ", ".join(msg["attachments"])
-                lines.append(f"  _Attachments: {attachments}_")
+            if msg.attachments:
+                attachments = ", ".join(msg.attachments)
+                yield f"  _Attachments: {attachments}_"
+
+        yield ""
 
-        lines.append("")
 
-    return "\n".join(lines)
+def format_messages_for_llm(data: ServerDigestData) -> str:
+    """Format Discord messages into text for LLM consumption.
+
+    Args:
+        data: Server digest data containing all messages.
+
+    Returns:
+        Formatted text string with messages organized by channel.
+    """
+    return "\n".join(iter_messages_for_llm(data))
 
 
 def format_time_range(start: datetime, end: datetime) -> str:
@@ -158,6 +192,10 @@ def create_full_digest(
 def get_default_output_filename(server_name: str) -> str:
     """Generate a default output filename.
 
+    Deliberately not memoized: the result embeds the current wall-clock
+    time, and a cached timestamp would make a second digest in the same
+    process silently overwrite the first one's file.
+
     Args:
         server_name: Name of the Discord server.
 
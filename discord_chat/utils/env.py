@@ -0,0 +1,16 @@
+"""Environment variable loading helpers."""
+
+import functools
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> None:
+    """Load variables from a .env file into the environment, once per process.
+
+    Deferred out of CLI startup so that --help, --version, and usage errors
+    never stat or parse .env; only commands that actually read environment
+    variables pay for it, and repeated calls in the same process are free.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
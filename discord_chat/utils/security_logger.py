@@ -4,15 +4,71 @@ This module provides security logging capabilities to track authentication,
 API usage, and security events for audit and incident response purposes.
 """
 
-import json
+import atexit
+import functools
 import logging
 import os
+import queue
+import re
+import time
 from datetime import UTC, datetime
 from enum import Enum
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Any
 
+# Message dicts are serialized on every logged event; orjson (C-level) is
+# several times faster than stdlib json here. Optional - install via the
+# `fast` extra - with a transparent stdlib fallback.
+try:
+    import orjson
+
+    def _dumps(obj: dict[str, Any]) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    import json
+
+    def _dumps(obj: dict[str, Any]) -> str:
+        return json.dumps(obj)
+
+
+@functools.lru_cache(maxsize=32)
+def _base_call_details(service: str, operation: str, success: bool) -> tuple:
+    """Return the static part of an api-call details dict, memoized.
+
+    The same (service, operation, success) triple recurs on every call
+    to a given API; caching the item tuple lets log_api_call rebuild the
+    dict with one C-level dict() instead of fresh literal construction.
+    """
+    return (("service", service), ("operation", operation), ("success", success))
+
+
+# Sensitive-key detector compiled once: one C-level scan per key instead
+# of a Python-level substring loop per key on every logged event.
+_SENSITIVE_RE = re.compile(r"token|api_key|password|secret|credential|auth", re.IGNORECASE)
+
+
+class _LazyJSON:
+    """Defers JSON serialization until a handler actually formats the record.
+
+    logging only calls __str__ when a handler accepts the record, so
+    filtered events never pay for json encoding. The timestamp is carried
+    as a cheap epoch float and rendered to ISO-8601 here, at the same
+    deferred point.
+    """
+
+    __slots__ = ("entry",)
+
+    def __init__(self, entry: dict[str, Any]):
+        self.entry = entry
+
+    def __str__(self) -> str:
+        ts = self.entry.get("timestamp")
+        if isinstance(ts, float):
+            self.entry["timestamp"] = datetime.fromtimestamp(ts, tz=UTC).isoformat()
+        return _dumps(self.entry)
+
 
 class SecurityEventType(Enum):
     """Types of security events to log."""
@@ -27,6 +83,48 @@ class SecurityEventType(Enum):
     SUSPICIOUS_ACTIVITY = "suspicious_activity"
 
 
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that enqueues records without formatting them.
+
+    Stdlib prepare() calls self.format(record) on the producer thread,
+    which would trigger _LazyJSON's JSON encode at enqueue time and
+    defeat the deferral above. Security-log records are self-contained -
+    no exc_info and no args beyond the _LazyJSON payload - so they can
+    cross to the listener thread as-is and pay for serialization there,
+    alongside the file write.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# Background listener draining the security-log queue to disk. Module
+# global so repeated SecurityLogger construction (e.g. in tests) replaces
+# the listener instead of leaking threads; stopped at interpreter exit so
+# pending events are flushed before the process ends.
+_queue_listener: QueueListener | None = None
+
+
+def _start_listener(log_queue: queue.SimpleQueue, *handlers: logging.Handler) -> None:
+    """(Re)start the background listener feeding the file handler."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+
+
+def _stop_listener() -> None:
+    """Stop the background listener, draining any queued events."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_listener)
+
+
 class SecurityLogger:
     """Security-focused logger with structured JSON output."""
 
@@ -68,7 +166,27 @@ class SecurityLogger:
                 encoding="utf-8",
             )
             file_handler.setLevel(logging.INFO)
-            self.logger.addHandler(file_handler)
+
+            # Disk writes and JSON serialization happen on the background
+            # listener thread; the caller's thread only pays for an
+            # enqueue, which keeps file I/O off the generate_digest hot
+            # path.
+            self._queue: queue.SimpleQueue = queue.SimpleQueue()
+            queue_handler = _DeferredQueueHandler(self._queue)
+            queue_handler.setLevel(logging.INFO)
+            self.logger.addHandler(queue_handler)
+            _start_listener(self._queue, file_handler)
+
+    def flush(self) -> None:
+        """Block until queued events have been written to the log file.
+
+        Logging is asynchronous; callers that need the file up to date
+        (tests, shutdown paths) can force the drain here.
+        """
+        listener = _queue_listener
+        if listener is not None:
+            listener.stop()
+            listener.start()
 
     def log_event(
         self,
@@ -76,6 +194,7 @@ class SecurityLogger:
         message: str,
         details: dict[str, Any] | None = None,
         level: int = logging.INFO,
+        skip_sanitize: bool = False,
     ) -> None:
         """Log a security event with structured data.
 
@@ -84,20 +203,29 @@ class SecurityLogger:
             message: Human-readable event description.
             details: Additional event details (will be sanitized).
             level: Logging level (default: INFO).
+            skip_sanitize: Skip detail sanitization; only for internal
+                callers whose details are known-constant keys.
         """
-        # Create structured log entry
+        # Standard logging fast path: skip all entry construction when no
+        # handler would accept the event anyway.
+        if not self.logger.isEnabledFor(level):
+            return
+
+        # Create structured log entry; the timestamp stays an epoch float
+        # until a handler formats the record (see _LazyJSON).
         log_entry = {
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": time.time(),
             "event_type": event_type.value,
             "message": message,
         }
 
         # Add sanitized details
         if details:
-            log_entry["details"] = self._sanitize_details(details)
+            log_entry["details"] = details if skip_sanitize else self._sanitize_details(details)
 
-        # Log as JSON for easy parsing
-        self.logger.log(level, json.dumps(log_entry))
+        # Log as JSON for easy parsing; serialization is deferred to
+        # handler-format time so filtered handlers never pay for it
+        self.logger.log(level, "%s", _LazyJSON(log_entry))
 
     def log_auth_attempt(self, success: bool, service: str, reason: str | None = None) -> None:
         """Log authentication attempt.
@@ -132,15 +260,38 @@ class SecurityLogger:
             success: Whether the call succeeded.
         """
         message = f"{service} API call: {operation}"
-        details = {
-            "service": service,
-            "operation": operation,
-            "success": success,
-        }
+        details = dict(_base_call_details(service, operation, success))
         if duration_ms is not None:
             details["duration_ms"] = duration_ms
 
-        self.log_event(SecurityEventType.API_CALL, message, details)
+        # Keys are fixed and non-sensitive; skip the sanitize scan
+        self.log_event(SecurityEventType.API_CALL, message, details, skip_sanitize=True)
+
+    def log_api_success(
+        self,
+        service: str,
+        operation: str,
+        duration_ms: float | None = None,
+    ) -> None:
+        """Log a successful API call and authentication as one event.
+
+        The success hot path used to emit separate api_call and
+        auth_success events back to back - two serializations and two
+        handler dispatches for one logical outcome. This folds them into
+        a single AUTH_SUCCESS event carrying the call details.
+
+        Args:
+            service: Service that was called (Discord, Claude, OpenAI).
+            operation: Operation that was performed.
+            duration_ms: Optional call duration in milliseconds.
+        """
+        message = f"{service} API call succeeded: {operation}"
+        details = dict(_base_call_details(service, operation, True))
+        if duration_ms is not None:
+            details["duration_ms"] = duration_ms
+
+        # Keys are fixed and non-sensitive; skip the sanitize scan
+        self.log_event(SecurityEventType.AUTH_SUCCESS, message, details, skip_sanitize=True)
 
     def log_rate_limit(self, service: str, concurrent_limit: int) -> None:
         """Log rate limiting enforcement.
@@ -203,19 +354,13 @@ class SecurityLogger:
         Returns:
             Sanitized details safe for logging.
         """
-        sanitized = {}
-        sensitive_keys = {
-            "token",
-            "api_key",
-            "password",
-            "secret",
-            "credential",
-            "auth",
-        }
+        if not details:
+            return {}
 
+        sanitized = {}
         for key, value in details.items():
             # Check if key contains sensitive term
-            if any(sensitive in key.lower() for sensitive in sensitive_keys):
+            if _SENSITIVE_RE.search(key):
                 sanitized[key] = "[REDACTED]"
             # Truncate very long strings
             elif isinstance(value, str) and len(value) > 500:
@@ -0,0 +1,169 @@
+"""Shared fixtures for the test suite.
+
+The sample server data used across the CLI, digest, and activity tests
+is immutable (frozen Message dataclasses, never mutated by the code
+under test), so it is built once per session instead of being
+reconstructed in every test. Times are frozen constants rather than
+datetime.now so the objects are genuinely reusable.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from click.testing import CliRunner
+
+from discord_chat.services.discord_client import ChannelMessages, Message, ServerDigestData
+
+# Frozen reference time for the shared fixtures; message timestamps
+# below fall inside the window. This (and the per-module NOW constants)
+# stand in for the real clock: nothing in the suite depends on the
+# actual time, so tests skip the clock_gettime syscall entirely.
+FROZEN_END_TIME = datetime(2024, 1, 1, 18, 0, tzinfo=UTC)
+
+
+@pytest.fixture(autouse=True)
+def _token(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Provide a valid-length Discord token for every test.
+
+    Replaces the @patch.dict("os.environ", ...) decorator that nearly
+    every CLI test stacked on top of its mock patches. Tests that need
+    the token absent clear the environment themselves.
+    """
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "t" * 60)
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """One CliRunner for the whole run; invoke() keeps no state between calls."""
+    return CliRunner()
+
+
+class _StubCall:
+    """Minimal stand-in for a stubbed method: counts calls, returns a set value."""
+
+    def __init__(self, return_value: str):
+        self.return_value = return_value
+        self.call_count = 0
+
+    def __call__(self, *args: object, **kwargs: object) -> str:
+        self.call_count += 1
+        return self.return_value
+
+    def assert_not_called(self) -> None:
+        assert self.call_count == 0, f"expected no calls, got {self.call_count}"
+
+
+class _StubLLM:
+    """Hand-rolled LLM provider stub.
+
+    The digest command only touches .name and .generate_digest, so a
+    plain class covers it without the inspect-driven spec introspection
+    MagicMock(spec=LLMProvider) pays on construction.
+    """
+
+    name = "TestLLM"
+
+    def __init__(self) -> None:
+        self.generate_digest = _StubCall("# Test Digest")
+
+
+_stub_provider = _StubLLM()
+
+
+@pytest.fixture
+def mock_provider() -> _StubLLM:
+    """Preconfigured LLM provider stub, reset between tests."""
+    _stub_provider.generate_digest.return_value = "# Test Digest"
+    _stub_provider.generate_digest.call_count = 0
+    return _stub_provider
+
+
+@pytest.fixture(scope="session")
+def sample_data() -> ServerDigestData:
+    """Sample server data with a few authored messages, shared per session."""
+    return ServerDigestData(
+        server_name="Test Server",
+        server_id=123456789,
+        channels=[
+            ChannelMessages(
+                channel_name="general",
+                channel_id=111,
+                messages=[
+                    Message(
+                        id=1,
+                        author="Alice",
+                        author_id=1001,
+                        content="Hello everyone!",
+                        timestamp_us=int(
+                            datetime(2024, 1, 1, 12, 0, tzinfo=UTC).timestamp() * 1_000_000
+                        ),
+                    ),
+                    Message(
+                        id=2,
+                        author="Bob",
+                        author_id=1002,
+                        content="Hi Alice!",
+                        timestamp_us=int(
+                            datetime(2024, 1, 1, 12, 5, tzinfo=UTC).timestamp() * 1_000_000
+                        ),
+                        reaction_emojis=("👋",),
+                        reaction_counts=(2,),
+                    ),
+                ],
+            ),
+            ChannelMessages(
+                channel_name="dev",
+                channel_id=222,
+                messages=[
+                    Message(
+                        id=3,
+                        author="Charlie",
+                        author_id=1003,
+                        content="Fixed the bug in PR #42",
+                        timestamp_us=int(
+                            datetime(2024, 1, 1, 13, 0, tzinfo=UTC).timestamp() * 1_000_000
+                        ),
+                        attachments=("screenshot.png",),
+                    ),
+                ],
+            ),
+        ],
+        start_time=FROZEN_END_TIME - timedelta(hours=6),
+        end_time=FROZEN_END_TIME,
+        total_messages=3,
+    )
+
+
+# Filler messages for the activity fixture: only the per-channel counts
+# matter to the tests, so build the Message objects once at import and
+# slice the shared pool instead of allocating 60 per construction.
+_FILLER_MSGS = [Message(id=i) for i in range(42)]
+
+
+@pytest.fixture(scope="session")
+def activity_data() -> ServerDigestData:
+    """Sample server data with per-channel message counts, shared per session."""
+    return ServerDigestData(
+        server_name="Test Server",
+        server_id=123456789,
+        channels=[
+            ChannelMessages(
+                channel_name="general",
+                channel_id=111,
+                messages=_FILLER_MSGS,
+            ),
+            ChannelMessages(
+                channel_name="dev",
+                channel_id=222,
+                messages=_FILLER_MSGS[:15],
+            ),
+            ChannelMessages(
+                channel_name="announcements",
+                channel_id=333,
+                messages=_FILLER_MSGS[:3],
+            ),
+        ],
+        start_time=FROZEN_END_TIME - timedelta(hours=24),
+        end_time=FROZEN_END_TIME,
+        total_messages=60,
+    )
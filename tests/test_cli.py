@@ -1,61 +1,33 @@
 """Tests for CLI flags and main command."""
 
-from datetime import UTC, datetime, timedelta
-from unittest.mock import MagicMock, patch
-
-from click.testing import CliRunner
+import os
+from datetime import UTC, datetime
+from unittest.mock import patch
 
 from cli import main
-from discord_chat.services.discord_client import ChannelMessages, ServerDigestData
-from discord_chat.services.llm.base import LLMProvider
-
-
-def create_sample_data() -> ServerDigestData:
-    """Create sample server data for testing."""
-    end_time = datetime.now(UTC)
-    start_time = end_time - timedelta(hours=6)
-
-    return ServerDigestData(
-        server_name="Test Server",
-        server_id=123456789,
-        channels=[
-            ChannelMessages(
-                channel_name="general",
-                channel_id=111,
-                messages=[
-                    {
-                        "id": 1,
-                        "author": "Alice",
-                        "author_id": 1001,
-                        "content": "Hello!",
-                        "timestamp": "2024-01-01T12:00:00",
-                        "attachments": [],
-                        "reactions": [],
-                    },
-                ],
-            ),
-        ],
-        start_time=start_time,
-        end_time=end_time,
-        total_messages=1,
-    )
+from discord_chat.services.discord_client import ServerDigestData
+
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
 
 
 class TestMainCLI:
     """Tests for main CLI command."""
 
-    def test_version_flag(self):
+    def test_version_flag(self, runner):
         """Test --version flag displays version."""
-        runner = CliRunner()
         result = runner.invoke(main, ["--version"])
 
         assert result.exit_code == 0
         assert "discord-chat" in result.output
         assert "version" in result.output.lower()
 
-    def test_help_flag(self):
-        """Test --help flag displays help."""
-        runner = CliRunner()
+    def test_help_flag(self, runner):
+        """Test --help lists the flags and subcommands.
+
+        One invocation covers the listing checks; --debug appearing in
+        the output already proves the flag is registered, so there is no
+        separate dispatch just for it.
+        """
         result = runner.invoke(main, ["--help"])
 
         assert result.exit_code == 0
@@ -65,28 +37,19 @@ class TestMainCLI:
         assert "digest" in result.output
         assert "activity" in result.output
 
-    def test_debug_flag_exists(self):
-        """Test --debug flag is recognized."""
-        runner = CliRunner()
-        result = runner.invoke(main, ["--debug", "--help"])
-
-        assert result.exit_code == 0
-
 
 class TestDigestDryRun:
     """Tests for digest --dry-run flag."""
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_dry_run_no_llm_call(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_dry_run_no_llm_call(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test --dry-run does not call LLM."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
+        mock_fetch.return_value = sample_data
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--dry-run"])
 
         assert result.exit_code == 0
@@ -95,17 +58,15 @@ class TestDigestDryRun:
         # LLM should not be called
         mock_provider.generate_digest.assert_not_called()
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_dry_run_shows_preview_info(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_dry_run_shows_preview_info(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test --dry-run shows useful preview information."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
+        mock_fetch.return_value = sample_data
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--dry-run"])
 
         assert result.exit_code == 0
@@ -118,20 +79,18 @@ class TestDigestDryRun:
         assert "Would display digest to screen" in result.output
         assert "No API calls made" in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_dry_run_no_messages(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_dry_run_no_messages(self, mock_fetch, runner):
         """Test --dry-run with no messages still exits cleanly."""
         mock_fetch.return_value = ServerDigestData(
             server_name="Empty Server",
             server_id=1,
             channels=[],
-            start_time=datetime.now(UTC),
-            end_time=datetime.now(UTC),
+            start_time=NOW,
+            end_time=NOW,
             total_messages=0,
         )
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--dry-run"])
 
         assert result.exit_code == 0
@@ -141,20 +100,16 @@ class TestDigestDryRun:
 class TestDigestQuiet:
     """Tests for digest --quiet flag."""
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_quiet_suppresses_console_output(self, mock_get_provider, mock_fetch):
-        """Test --quiet suppresses console output."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
-        mock_provider.generate_digest.return_value = "# Test Digest"
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_quiet_suppresses_console_output(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider, tmp_path
+    ):
+        """Test --quiet suppresses console output but still writes the file."""
+        mock_fetch.return_value = sample_data
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
-        with runner.isolated_filesystem():
-            result = runner.invoke(main, ["digest", "test-server", "--quiet", "--file", "."])
+        result = runner.invoke(main, ["digest", "test-server", "--quiet", "--file", str(tmp_path)])
 
         assert result.exit_code == 0
         # Should not have verbose output
@@ -163,43 +118,24 @@ class TestDigestQuiet:
         # Digest content should not be printed
         assert "Test Digest" not in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_quiet_still_writes_file(self, mock_get_provider, mock_fetch):
-        """Test --quiet still writes output file."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
-        mock_provider.generate_digest.return_value = "# Test Digest"
-        mock_get_provider.return_value = mock_provider
-
-        runner = CliRunner()
-        with runner.isolated_filesystem():
-            result = runner.invoke(main, ["digest", "test-server", "--quiet", "--file", "."])
-
-            assert result.exit_code == 0
-            # Check that a file was created
-            import os
-
-            files = os.listdir(".")
-            digest_files = [f for f in files if f.startswith("digest-") and f.endswith(".md")]
-            assert len(digest_files) == 1
+        # The file is still written; asserted on the same invocation
+        # rather than re-running the CLI.
+        files = os.listdir(tmp_path)
+        digest_files = [f for f in files if f.startswith("digest-") and f.endswith(".md")]
+        assert len(digest_files) == 1
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_quiet_no_messages_silent(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_quiet_no_messages_silent(self, mock_fetch, runner):
         """Test --quiet is silent even with no messages."""
         mock_fetch.return_value = ServerDigestData(
             server_name="Empty Server",
             server_id=1,
             channels=[],
-            start_time=datetime.now(UTC),
-            end_time=datetime.now(UTC),
+            start_time=NOW,
+            end_time=NOW,
             total_messages=0,
         )
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--quiet"])
 
         assert result.exit_code == 0
@@ -210,20 +146,16 @@ class TestDigestQuiet:
 class TestDigestQuietShortFlag:
     """Tests for digest -q short flag."""
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_short_quiet_flag(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_short_quiet_flag(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider, tmp_path
+    ):
         """Test -q works same as --quiet."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
-        mock_provider.generate_digest.return_value = "# Test Digest"
+        mock_fetch.return_value = sample_data
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
-        with runner.isolated_filesystem():
-            result = runner.invoke(main, ["digest", "test-server", "-q", "--file", "."])
+        result = runner.invoke(main, ["digest", "test-server", "-q", "--file", str(tmp_path)])
 
         assert result.exit_code == 0
         assert "Fetching messages" not in result.output
@@ -232,17 +164,15 @@ class TestDigestQuietShortFlag:
 class TestDigestCombinedFlags:
     """Tests for combining digest flags."""
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_dry_run_with_quiet(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_dry_run_with_quiet(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test --dry-run with --quiet shows nothing."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
+        mock_fetch.return_value = sample_data
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--dry-run", "--quiet"])
 
         assert result.exit_code == 0
@@ -253,20 +183,16 @@ class TestDigestCombinedFlags:
 class TestProgressStatus:
     """Tests for progress status indicators."""
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_progress_shows_timing(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_progress_shows_timing(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider, tmp_path
+    ):
         """Test that progress indicators show timing."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
-        mock_provider.generate_digest.return_value = "# Test Digest"
+        mock_fetch.return_value = sample_data
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
-        with runner.isolated_filesystem():
-            result = runner.invoke(main, ["digest", "test-server", "--file", "."])
+        result = runner.invoke(main, ["digest", "test-server", "--file", str(tmp_path)])
 
         assert result.exit_code == 0
         # Should show timing like "done (0.1s)"
@@ -1,17 +1,16 @@
 """Tests for the digest command."""
 
-from datetime import UTC, datetime, timedelta
+from dataclasses import replace
+from datetime import UTC, datetime
 from io import StringIO
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
-from click.testing import CliRunner
 from rich.console import Console
 
 from cli import main
 from discord_chat.services.discord_client import ChannelMessages, ServerDigestData
 from discord_chat.services.llm import LLMError, get_provider
-from discord_chat.services.llm.base import LLMProvider
 from discord_chat.utils.digest_formatter import (
     InvalidServerNameError,
     format_messages_for_llm,
@@ -20,69 +19,15 @@ from discord_chat.utils.digest_formatter import (
     validate_server_name,
 )
 
-
-# Sample test data
-def create_sample_data() -> ServerDigestData:
-    """Create sample server data for testing."""
-    end_time = datetime.now(UTC)
-    start_time = end_time - timedelta(hours=6)
-
-    return ServerDigestData(
-        server_name="Test Server",
-        server_id=123456789,
-        channels=[
-            ChannelMessages(
-                channel_name="general",
-                channel_id=111,
-                messages=[
-                    {
-                        "id": 1,
-                        "author": "Alice",
-                        "author_id": 1001,
-                        "content": "Hello everyone!",
-                        "timestamp": "2024-01-01T12:00:00",
-                        "attachments": [],
-                        "reactions": [],
-                    },
-                    {
-                        "id": 2,
-                        "author": "Bob",
-                        "author_id": 1002,
-                        "content": "Hi Alice!",
-                        "timestamp": "2024-01-01T12:05:00",
-                        "attachments": [],
-                        "reactions": [{"emoji": "👋", "count": 2}],
-                    },
-                ],
-            ),
-            ChannelMessages(
-                channel_name="dev",
-                channel_id=222,
-                messages=[
-                    {
-                        "id": 3,
-                        "author": "Charlie",
-                        "author_id": 1003,
-                        "content": "Fixed the bug in PR #42",
-                        "timestamp": "2024-01-01T13:00:00",
-                        "attachments": ["screenshot.png"],
-                        "reactions": [],
-                    },
-                ],
-            ),
-        ],
-        start_time=start_time,
-        end_time=end_time,
-        total_messages=3,
-    )
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
 
 
 class TestDigestFormatter:
     """Tests for digest formatter utilities."""
 
-    def test_format_messages_for_llm(self):
+    def test_format_messages_for_llm(self, sample_data):
         """Test formatting messages for LLM consumption."""
-        data = create_sample_data()
+        data = sample_data
         result = format_messages_for_llm(data)
 
         assert "## #general" in result
@@ -99,8 +44,8 @@ class TestDigestFormatter:
             server_name="Empty Server",
             server_id=1,
             channels=[],
-            start_time=datetime.now(UTC),
-            end_time=datetime.now(UTC),
+            start_time=NOW,
+            end_time=NOW,
             total_messages=0,
         )
         result = format_messages_for_llm(data)
@@ -192,31 +137,25 @@ class TestServerNameValidation:
 class TestHoursValidation:
     """Tests for hours range validation."""
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_digest_hours_too_low(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_digest_hours_too_low(self, mock_fetch, runner):
         """Test digest command rejects hours < 1."""
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--hours", "0"])
 
         assert result.exit_code != 0
         assert "Hours must be between" in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_digest_hours_too_high(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_digest_hours_too_high(self, mock_fetch, runner):
         """Test digest command rejects hours > 168."""
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--hours", "200"])
 
         assert result.exit_code != 0
         assert "Hours must be between" in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_digest_hours_negative(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_digest_hours_negative(self, mock_fetch, runner):
         """Test digest command rejects negative hours."""
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--hours", "-5"])
 
         assert result.exit_code != 0
@@ -260,51 +199,45 @@ class TestLLMProvider:
 class TestDigestCommand:
     """Tests for the digest CLI command."""
 
-    def test_digest_no_token(self):
+    def test_digest_no_token(self, runner):
         """Test digest command fails without Discord token."""
-        runner = CliRunner()
-
         with patch.dict("os.environ", {}, clear=True):
             result = runner.invoke(main, ["digest", "test-server"])
 
         assert result.exit_code != 0
         assert "DISCORD_BOT_TOKEN" in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_digest_no_messages(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_digest_no_messages(self, mock_get_provider, mock_fetch, runner):
         """Test digest command with no messages found."""
         mock_fetch.return_value = ServerDigestData(
             server_name="Test Server",
             server_id=1,
             channels=[],
-            start_time=datetime.now(UTC),
-            end_time=datetime.now(UTC),
+            start_time=NOW,
+            end_time=NOW,
             total_messages=0,
         )
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server"])
 
         assert result.exit_code == 0
         assert "No messages found" in result.output
         mock_get_provider.assert_not_called()
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_digest_success(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_digest_success(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test successful digest generation."""
         # Setup mocks
-        mock_fetch.return_value = create_sample_data()
+        mock_fetch.return_value = sample_data
 
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
         mock_provider.generate_digest.return_value = "# Test Digest\n\nThis is a test."
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         with runner.isolated_filesystem():
             result = runner.invoke(main, ["digest", "test-server", "--file", "."])
 
@@ -313,9 +246,8 @@ class TestDigestCommand:
         assert "Test Digest" in result.output
         assert "Digest saved to" in result.output
 
-    def test_digest_help(self):
+    def test_digest_help(self, runner):
         """Test digest command help."""
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "--help"])
 
         assert result.exit_code == 0
@@ -329,18 +261,16 @@ class TestDigestCommand:
 class TestDigestScreenOutput:
     """Tests for Rich screen output functionality."""
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_digest_screen_output_default_no_file(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_digest_screen_output_default_no_file(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test digest outputs to screen by default (no file created)."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
+        mock_fetch.return_value = sample_data
         mock_provider.generate_digest.return_value = "# Test Digest\n\nContent here."
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         with runner.isolated_filesystem():
             result = runner.invoke(main, ["digest", "test-server"])
 
@@ -355,18 +285,16 @@ class TestDigestScreenOutput:
             digest_files = [f for f in files if f.startswith("digest-")]
             assert len(digest_files) == 0
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_digest_file_output_with_flag(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_digest_file_output_with_flag(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test digest saves to file when --file flag is provided."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
+        mock_fetch.return_value = sample_data
         mock_provider.generate_digest.return_value = "# Test Digest\n\nContent here."
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         with runner.isolated_filesystem():
             result = runner.invoke(main, ["digest", "test-server", "--file", "."])
 
@@ -379,18 +307,15 @@ class TestDigestScreenOutput:
             digest_files = [f for f in files if f.startswith("digest-")]
             assert len(digest_files) == 1
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_digest_quiet_mode_with_file(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_digest_quiet_mode_with_file(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test quiet mode suppresses output but still saves file."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
-        mock_provider.generate_digest.return_value = "# Test Digest"
+        mock_fetch.return_value = sample_data
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         with runner.isolated_filesystem():
             result = runner.invoke(main, ["digest", "test-server", "--quiet", "--file", "."])
 
@@ -404,18 +329,16 @@ class TestDigestScreenOutput:
             digest_files = [f for f in files if f.startswith("digest-")]
             assert len(digest_files) == 1
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_digest_file_with_custom_path(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_digest_file_with_custom_path(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test --file with a specific file path."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
+        mock_fetch.return_value = sample_data
         mock_provider.generate_digest.return_value = "# Test"
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         with runner.isolated_filesystem():
             result = runner.invoke(main, ["digest", "test-server", "--file", "my-digest.md"])
 
@@ -424,18 +347,15 @@ class TestDigestScreenOutput:
 
             assert os.path.exists("my-digest.md")
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_digest_no_color_flag(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_digest_no_color_flag(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test --no-color flag disables styling."""
-        mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
-        mock_provider.generate_digest.return_value = "# Test Digest"
+        mock_fetch.return_value = sample_data
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         with runner.isolated_filesystem():
             result = runner.invoke(main, ["digest", "test-server", "--no-color"])
 
@@ -486,55 +406,79 @@ class TestConsoleOutputModule:
         console = create_console()
         assert console is not None
 
+    def test_render_digest_stream_accumulates_chunks(self):
+        """Test that the streaming renderer returns the full text."""
+        from discord_chat.utils.console_output import render_digest_stream_to_console
+
+        output = StringIO()
+        console = Console(file=output, force_terminal=True)
+
+        full = render_digest_stream_to_console(
+            iter(["# Stream", " Heading\n\n", "body text"]),
+            console=console,
+            quiet=False,
+        )
+
+        assert full == "# Stream Heading\n\nbody text"
+        assert "Stream" in output.getvalue()
+
+    def test_render_digest_stream_quiet_mode(self):
+        """Test that quiet mode drains the stream without rendering."""
+        from discord_chat.utils.console_output import render_digest_stream_to_console
+
+        output = StringIO()
+        console = Console(file=output, force_terminal=True)
+
+        full = render_digest_stream_to_console(
+            iter(["# Test", " chunk"]), console=console, quiet=True
+        )
+
+        assert full == "# Test chunk"
+        assert output.getvalue() == ""
+
 
 class TestDigestChannelFilter:
     """Tests for --channel filtering option."""
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_channel_filter_single_channel(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_channel_filter_single_channel(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test digest with --channel filters to single channel."""
-        mock_fetch.return_value = create_sample_data()
+        mock_fetch.return_value = sample_data
 
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
         mock_provider.generate_digest.return_value = "# Filtered Digest"
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--channel", "general"])
 
         assert result.exit_code == 0
         # Should show messages only from general (2 messages)
         assert "Found 2 messages in #general" in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_channel_filter_case_insensitive(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_channel_filter_case_insensitive(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test --channel is case-insensitive."""
-        mock_fetch.return_value = create_sample_data()
+        mock_fetch.return_value = sample_data
 
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
         mock_provider.generate_digest.return_value = "# Filtered Digest"
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         # Use uppercase "GENERAL" to match "general"
         result = runner.invoke(main, ["digest", "test-server", "--channel", "GENERAL"])
 
         assert result.exit_code == 0
         assert "Found 2 messages in #GENERAL" in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_channel_filter_not_found(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_channel_filter_not_found(self, mock_fetch, sample_data, runner):
         """Test error when specified channel doesn't exist."""
-        mock_fetch.return_value = create_sample_data()
+        mock_fetch.return_value = sample_data
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--channel", "nonexistent"])
 
         assert result.exit_code != 0
@@ -543,100 +487,92 @@ class TestDigestChannelFilter:
         assert "#dev" in result.output
         assert "#general" in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_channel_filter_with_dry_run(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_channel_filter_with_dry_run(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test --dry-run shows channel filter."""
-        mock_fetch.return_value = create_sample_data()
+        mock_fetch.return_value = sample_data
 
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--channel", "dev", "--dry-run"])
 
         assert result.exit_code == 0
         assert "Channel filter" in result.output
         assert "#dev" in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_channel_filter_updates_message_count(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_channel_filter_updates_message_count(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test total_messages reflects filtered channel only."""
-        mock_fetch.return_value = create_sample_data()
+        mock_fetch.return_value = sample_data
 
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
         mock_provider.generate_digest.return_value = "# Test"
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         # Filter to "dev" channel which has 1 message
         result = runner.invoke(main, ["digest", "test-server", "--channel", "dev"])
 
         assert result.exit_code == 0
         assert "Found 1 messages in #dev" in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_channel_filter_short_flag(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_channel_filter_short_flag(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test -c short flag works."""
-        mock_fetch.return_value = create_sample_data()
+        mock_fetch.return_value = sample_data
 
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
         mock_provider.generate_digest.return_value = "# Test"
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "-c", "general"])
 
         assert result.exit_code == 0
         assert "Found 2 messages in #general" in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_channel_filter_with_hash_prefix(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_channel_filter_with_hash_prefix(
+        self, mock_get_provider, mock_fetch, sample_data, runner, mock_provider
+    ):
         """Test channel filter accepts #channel format."""
-        mock_fetch.return_value = create_sample_data()
+        mock_fetch.return_value = sample_data
 
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
         mock_provider.generate_digest.return_value = "# Test"
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         # User passes "#general" instead of "general"
         result = runner.invoke(main, ["digest", "test-server", "--channel", "#general"])
 
         assert result.exit_code == 0
         assert "messages in ##general" in result.output or "Found 2 messages" in result.output
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "test-token"})
-    def test_channel_filter_empty_channel(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_channel_filter_empty_channel(self, mock_fetch, sample_data, runner):
         """Test filtering to channel with no messages shows empty digest message."""
-        # Create data with an empty channel
-        data = create_sample_data()
-        data.channels.append(
-            ChannelMessages(channel_name="empty-channel", channel_id=333, messages=[])
+        # Copy the shared fixture rather than mutating it, adding an empty channel
+        data = replace(
+            sample_data,
+            channels=[
+                *sample_data.channels,
+                ChannelMessages(channel_name="empty-channel", channel_id=333, messages=[]),
+            ],
         )
         mock_fetch.return_value = data
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--channel", "empty-channel"])
 
         assert result.exit_code == 0
         assert "No messages found in #empty-channel" in result.output
 
-    def test_channel_filter_in_help(self):
+    def test_channel_filter_in_help(self, runner):
         """Test --channel appears in help."""
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "--help"])
 
         assert result.exit_code == 0
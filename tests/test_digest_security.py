@@ -13,20 +13,20 @@ import stat
 import tempfile
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
-from click.testing import CliRunner
 
 from cli import main
 from discord_chat.commands.digest import progress_status, write_file_secure
-from discord_chat.services.discord_client import ChannelMessages, ServerDigestData
-from discord_chat.services.llm.base import LLMProvider
+from discord_chat.services.discord_client import ChannelMessages, Message, ServerDigestData
+
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
 
 
 def create_sample_data(hours: int = 6) -> ServerDigestData:
     """Create sample server data for testing."""
-    end_time = datetime.now(UTC)
+    end_time = NOW
     start_time = end_time - timedelta(hours=hours)
 
     return ServerDigestData(
@@ -37,15 +37,15 @@ def create_sample_data(hours: int = 6) -> ServerDigestData:
                 channel_name="general",
                 channel_id=111,
                 messages=[
-                    {
-                        "id": 1,
-                        "author": "Alice",
-                        "author_id": 1001,
-                        "content": "Hello everyone!",
-                        "timestamp": "2024-01-01T12:00:00",
-                        "attachments": [],
-                        "reactions": [],
-                    },
+                    Message(
+                        id=1,
+                        author="Alice",
+                        author_id=1001,
+                        content="Hello everyone!",
+                        timestamp_us=int(
+                            datetime(2024, 1, 1, 12, 0, tzinfo=UTC).timestamp() * 1_000_000
+                        ),
+                    ),
                 ],
             ),
         ],
@@ -262,18 +262,16 @@ class TestBoundaryConditions:
     # Token must be 50+ chars to pass validation
     VALID_TOKEN = "t" * 60
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_digest_hours_minimum_boundary(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_digest_hours_minimum_boundary(
+        self, mock_get_provider, mock_fetch, runner, mock_provider
+    ):
         """MT-013: Test digest with exactly 1 hour (minimum valid)."""
         mock_fetch.return_value = create_sample_data(hours=1)
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
         mock_provider.generate_digest.return_value = "# Digest"
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         with runner.isolated_filesystem():
             result = runner.invoke(main, ["digest", "TestServer", "--hours", "1", "--file", "."])
 
@@ -284,18 +282,16 @@ class TestBoundaryConditions:
         call_args = mock_fetch.call_args
         assert call_args[0][1] == 1  # hours argument
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_digest_hours_maximum_boundary(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_digest_hours_maximum_boundary(
+        self, mock_get_provider, mock_fetch, runner, mock_provider
+    ):
         """MT-014: Test digest with exactly 168 hours (maximum valid)."""
         mock_fetch.return_value = create_sample_data(hours=168)
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
         mock_provider.generate_digest.return_value = "# Digest"
         mock_get_provider.return_value = mock_provider
 
-        runner = CliRunner()
         with runner.isolated_filesystem():
             result = runner.invoke(main, ["digest", "TestServer", "--hours", "168", "--file", "."])
 
@@ -306,19 +302,15 @@ class TestBoundaryConditions:
         call_args = mock_fetch.call_args
         assert call_args[0][1] == 168  # hours argument
 
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_digest_hours_just_below_minimum(self):
+    def test_digest_hours_just_below_minimum(self, runner):
         """Test that hours=0 fails validation."""
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "TestServer", "--hours", "0"])
 
         assert result.exit_code != 0
         assert "Hours must be between" in result.output
 
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_digest_hours_just_above_maximum(self):
+    def test_digest_hours_just_above_maximum(self, runner):
         """Test that hours=169 fails validation."""
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "TestServer", "--hours", "169"])
 
         assert result.exit_code != 0
@@ -328,15 +320,13 @@ class TestBoundaryConditions:
 class TestSymlinkAttackIntegration:
     """Integration tests for symlink attack prevention in full digest flow."""
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch("discord_chat.commands.digest.get_provider")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_digest_command_rejects_symlink_output(self, mock_get_provider, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    @patch("discord_chat.services.llm.get_provider")
+    def test_digest_command_rejects_symlink_output(
+        self, mock_get_provider, mock_fetch, runner, mock_provider
+    ):
         """Test that full digest command rejects symlink output path."""
         mock_fetch.return_value = create_sample_data()
-        mock_provider = MagicMock(spec=LLMProvider)
-        mock_provider.name = "TestLLM"
-        mock_provider.generate_digest.return_value = "# Test Digest"
         mock_get_provider.return_value = mock_provider
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -350,7 +340,6 @@ class TestSymlinkAttackIntegration:
 
             # We can't predict the exact filename (has timestamp),
             # but we can verify write_file_secure is being used
-            runner = CliRunner()
             result = runner.invoke(
                 main,
                 ["digest", "TestServer", "--file", str(output_dir)],
@@ -363,9 +352,8 @@ class TestSymlinkAttackIntegration:
 class TestChannelNameSecurity:
     """Security tests for --channel option input validation."""
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_channel_name_with_path_traversal_handled_safely(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_channel_name_with_path_traversal_handled_safely(self, mock_fetch, runner):
         """Test that path traversal in channel name is handled safely.
 
         Channel names are matched against actual channel names from Discord,
@@ -373,46 +361,39 @@ class TestChannelNameSecurity:
         """
         mock_fetch.return_value = create_sample_data()
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--channel", "../../../etc/passwd"])
 
         # Should fail with "not found" - channel names are matched exactly
         assert result.exit_code != 0
         assert "not found" in result.output.lower()
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_channel_name_with_null_bytes(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_channel_name_with_null_bytes(self, mock_fetch, runner):
         """Test channel names with null bytes are handled safely."""
         mock_fetch.return_value = create_sample_data()
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--channel", "general\x00evil"])
 
         # Should not match any channel
         assert result.exit_code != 0
         assert "not found" in result.output.lower()
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_channel_name_with_newlines(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_channel_name_with_newlines(self, mock_fetch, runner):
         """Test channel names with newlines are handled safely."""
         mock_fetch.return_value = create_sample_data()
 
-        runner = CliRunner()
         result = runner.invoke(main, ["digest", "test-server", "--channel", "general\nevil"])
 
         # Should not match any channel
         assert result.exit_code != 0
         assert "not found" in result.output.lower()
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_channel_name_very_long_string(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_channel_name_very_long_string(self, mock_fetch, runner):
         """Test very long channel names are handled safely."""
         mock_fetch.return_value = create_sample_data()
 
-        runner = CliRunner()
         long_channel = "a" * 10000  # Very long channel name
         result = runner.invoke(main, ["digest", "test-server", "--channel", long_channel])
 
@@ -420,13 +401,11 @@ class TestChannelNameSecurity:
         assert result.exit_code != 0
         assert "not found" in result.output.lower()
 
-    @patch("discord_chat.commands.digest.fetch_server_messages")
-    @patch.dict("os.environ", {"DISCORD_BOT_TOKEN": "t" * 60})
-    def test_channel_name_with_special_chars(self, mock_fetch):
+    @patch("discord_chat.services.discord_client.fetch_server_messages")
+    def test_channel_name_with_special_chars(self, mock_fetch, runner):
         """Test channel names with special characters are handled safely."""
         mock_fetch.return_value = create_sample_data()
 
-        runner = CliRunner()
         result = runner.invoke(
             main, ["digest", "test-server", "--channel", "general<script>alert('xss')</script>"]
         )
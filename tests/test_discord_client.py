@@ -9,6 +9,7 @@ from discord_chat.services.discord_client import (
     ChannelMessages,
     DiscordClientError,
     DiscordMessageFetcher,
+    Message,
     ServerDigestData,
     ServerNotFoundError,
     _get_env_int,
@@ -134,7 +135,7 @@ class TestDataClasses:
         channel = ChannelMessages(
             channel_name="general",
             channel_id=123,
-            messages=[{"id": 1}, {"id": 2}],
+            messages=[Message(id=1), Message(id=2)],
         )
 
         assert channel.channel_name == "general"
@@ -21,8 +21,10 @@ from discord_chat.services.discord_client import (
     ChannelMessages,
     DiscordClientError,
     DiscordMessageFetcher,
+    Message,
     ServerDigestData,
     ServerNotFoundError,
+    _get_fetch_limiter,
 )
 
 
@@ -255,8 +257,8 @@ class TestFetchChannelMessages:
                         assert result.channel_name == "general"
                         assert result.channel_id == 111
                         assert len(result.messages) == 1
-                        assert result.messages[0]["content"] == "Hello world!"
-                        assert result.messages[0]["author"] == "Alice"
+                        assert result.messages[0].content == "Hello world!"
+                        assert result.messages[0].author == "Alice"
 
     @pytest.mark.asyncio
     async def test_fetch_channel_messages_filters_bot_messages(self):
@@ -303,7 +305,7 @@ class TestFetchChannelMessages:
                         )
 
                         assert len(result.messages) == 1
-                        assert result.messages[0]["content"] == "User message"
+                        assert result.messages[0].content == "User message"
 
     @pytest.mark.asyncio
     async def test_fetch_channel_messages_filters_empty_messages(self):
@@ -352,7 +354,7 @@ class TestFetchChannelMessages:
                         )
 
                         assert len(result.messages) == 1
-                        assert result.messages[0]["content"] == "Hello"
+                        assert result.messages[0].content == "Hello"
 
     @pytest.mark.asyncio
     async def test_fetch_channel_messages_truncates_long_content(self):
@@ -395,8 +397,8 @@ class TestFetchChannelMessages:
 
                         assert len(result.messages) == 1
                         # Should be truncated to MAX_MESSAGE_CONTENT_LENGTH + "[truncated]"
-                        assert len(result.messages[0]["content"]) == 100_000 + len("...[truncated]")
-                        assert result.messages[0]["content"].endswith("...[truncated]")
+                        assert len(result.messages[0].content) == 100_000 + len("...[truncated]")
+                        assert result.messages[0].content.endswith("...[truncated]")
 
     @pytest.mark.asyncio
     async def test_fetch_channel_messages_limits_attachments(self):
@@ -445,8 +447,8 @@ class TestFetchChannelMessages:
 
                         assert len(result.messages) == 1
                         # Should have 10 files + overflow message
-                        assert len(result.messages[0]["attachments"]) == 11
-                        assert result.messages[0]["attachments"][10] == "...and 5 more"
+                        assert len(result.messages[0].attachments) == 11
+                        assert result.messages[0].attachments[10] == "...and 5 more"
 
     @pytest.mark.asyncio
     async def test_fetch_channel_messages_limits_reactions(self):
@@ -456,7 +458,7 @@ class TestFetchChannelMessages:
             with tempfile.TemporaryDirectory() as tmpdir:
                 with patch.dict("os.environ", {"DISCORD_CHAT_SECURITY_LOG": f"{tmpdir}/sec.log"}):
                     with patch("discord_chat.services.discord_client.discord.Client"):
-                        fetcher = DiscordMessageFetcher()
+                        fetcher = DiscordMessageFetcher(include_reactions=True)
 
                         channel = Mock(spec=discord.TextChannel)
                         channel.name = "general"
@@ -495,7 +497,7 @@ class TestFetchChannelMessages:
 
                         assert len(result.messages) == 1
                         # Should be limited to 20 reactions
-                        assert len(result.messages[0]["reactions"]) == 20
+                        assert len(result.messages[0].reaction_emojis) == 20
 
     @pytest.mark.asyncio
     async def test_fetch_channel_messages_truncates_author_name(self):
@@ -534,11 +536,11 @@ class TestFetchChannelMessages:
                             channel, start_time, end_time
                         )
 
-                        assert len(result.messages[0]["author"]) == 100
+                        assert len(result.messages[0].author) == 100
 
     @pytest.mark.asyncio
-    async def test_fetch_channel_messages_sorts_by_timestamp(self):
-        """Test that messages are sorted by timestamp."""
+    async def test_fetch_channel_messages_preserves_history_order(self):
+        """Test that chronological history order is preserved without re-sorting."""
         valid_token = "x" * 60
         with patch.dict("os.environ", {"DISCORD_BOT_TOKEN": valid_token}):
             with tempfile.TemporaryDirectory() as tmpdir:
@@ -573,10 +575,10 @@ class TestFetchChannelMessages:
                         msg2.attachments = []
                         msg2.reactions = []
 
-                        # Yield in reverse order
+                        # history() with `after` yields chronologically
                         async def mock_history(*args, **kwargs):
-                            yield msg2
                             yield msg1
+                            yield msg2
 
                         channel.history = mock_history
 
@@ -587,9 +589,9 @@ class TestFetchChannelMessages:
                             channel, start_time, end_time
                         )
 
-                        # Should be sorted by timestamp
-                        assert result.messages[0]["content"] == "First"
-                        assert result.messages[1]["content"] == "Second"
+                        # Chronological order should be preserved as-is
+                        assert result.messages[0].content == "First"
+                        assert result.messages[1].content == "Second"
 
     @pytest.mark.asyncio
     async def test_fetch_channel_messages_handles_forbidden(self):
@@ -812,6 +814,47 @@ class TestFetchChannelsWithRateLimiting:
                         # Max concurrent should not exceed the semaphore limit
                         assert max_concurrent <= 2
 
+    @pytest.mark.asyncio
+    async def test_iter_server_channels_yields_as_completed(self):
+        """Test that the streaming variant yields every channel's result."""
+        valid_token = "x" * 60
+        with patch.dict("os.environ", {"DISCORD_BOT_TOKEN": valid_token}):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                with patch.dict("os.environ", {"DISCORD_CHAT_SECURITY_LOG": f"{tmpdir}/sec.log"}):
+                    with patch("discord_chat.services.discord_client.discord.Client"):
+                        fetcher = DiscordMessageFetcher()
+
+                        async def mock_fetch(channel, after, before):
+                            # Later channels finish first
+                            await asyncio.sleep(0.01 * (3 - channel.id % 100))
+                            return ChannelMessages(
+                                channel_name=channel.name,
+                                channel_id=channel.id,
+                                messages=[],
+                            )
+
+                        fetcher._fetch_channel_messages = mock_fetch
+
+                        channels = []
+                        for i in range(3):
+                            ch = Mock(spec=discord.TextChannel)
+                            ch.name = f"channel-{i}"
+                            ch.id = 100 + i
+                            channels.append(ch)
+
+                        start_time = datetime.now(UTC) - timedelta(hours=1)
+                        end_time = datetime.now(UTC)
+
+                        seen = []
+                        async for result in fetcher.iter_server_channels(
+                            channels, start_time, end_time
+                        ):
+                            seen.append(result.channel_name)
+
+                        # Completion order, not submission order
+                        assert sorted(seen) == ["channel-0", "channel-1", "channel-2"]
+                        assert seen[0] == "channel-2"
+
     @pytest.mark.asyncio
     async def test_fetch_channels_logs_security_events(self):
         """Test that rate limiting and API calls are logged."""
@@ -852,6 +895,58 @@ class TestFetchChannelsWithRateLimiting:
                         mock_logger.log_api_call.assert_called_once()
 
 
+class TestFetchLimiterResize:
+    """Tests for _set_fetch_limit resizing the shared gate under contention."""
+
+    @pytest.mark.asyncio
+    async def test_set_fetch_limit_grows_and_shrinks_under_contention(self):
+        """Raising the cap wakes blocked workers; lowering drains gradually."""
+        valid_token = "x" * 60
+        with patch.dict("os.environ", {"DISCORD_BOT_TOKEN": valid_token}):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                with patch.dict("os.environ", {"DISCORD_CHAT_SECURITY_LOG": f"{tmpdir}/sec.log"}):
+                    with patch("discord_chat.services.discord_client.discord.Client"):
+                        fetcher = DiscordMessageFetcher()
+
+                        # Fresh loop per test, so this creates the loop's limiter
+                        limiter = _get_fetch_limiter(1)
+                        release = asyncio.Event()
+
+                        async def worker():
+                            async with limiter.cond:
+                                await limiter.cond.wait_for(lambda: limiter.active < limiter.limit)
+                                limiter.active += 1
+                            try:
+                                await release.wait()
+                            finally:
+                                async with limiter.cond:
+                                    limiter.active -= 1
+                                    limiter.cond.notify_all()
+
+                        async def settle(predicate):
+                            for _ in range(100):
+                                if predicate():
+                                    return
+                                await asyncio.sleep(0)
+                            raise AssertionError("limiter never reached expected state")
+
+                        tasks = [asyncio.create_task(worker()) for _ in range(3)]
+                        await settle(lambda: limiter.active == 1)
+
+                        # Growing the limit wakes the two blocked workers
+                        await fetcher._set_fetch_limit(3)
+                        await settle(lambda: limiter.active == 3)
+
+                        # Shrinking never interrupts in-flight work...
+                        await fetcher._set_fetch_limit(1)
+                        assert limiter.active == 3
+
+                        # ...and the gate drains cleanly once workers finish
+                        release.set()
+                        await asyncio.gather(*tasks)
+                        assert limiter.active == 0
+
+
 class TestFetchServerMessagesImpl:
     """Tests for _fetch_server_messages_impl async method."""
 
@@ -883,7 +978,7 @@ class TestFetchServerMessagesImpl:
                         channel = Mock(spec=discord.TextChannel)
                         channel.name = "general"
                         channel.id = 111
-                        guild.channels = [channel]
+                        guild.text_channels = [channel]
 
                         # Mock _fetch_channels_with_rate_limiting
                         async def mock_fetch_channels(channels, after, before):
@@ -892,12 +987,14 @@ class TestFetchServerMessagesImpl:
                                     channel_name="general",
                                     channel_id=111,
                                     messages=[
-                                        {
-                                            "id": 1,
-                                            "author": "Alice",
-                                            "content": "Hello",
-                                            "timestamp": datetime.now(UTC).isoformat(),
-                                        }
+                                        Message(
+                                            id=1,
+                                            author="Alice",
+                                            content="Hello",
+                                            timestamp_us=int(
+                                                datetime.now(UTC).timestamp() * 1_000_000
+                                            ),
+                                        )
                                     ],
                                 )
                             ]
@@ -937,7 +1034,7 @@ class TestFetchServerMessagesImpl:
 
                         channel1 = Mock(spec=discord.TextChannel)
                         channel2 = Mock(spec=discord.TextChannel)
-                        guild.channels = [channel1, channel2]
+                        guild.text_channels = [channel1, channel2]
 
                         async def mock_fetch_channels(channels, after, before):
                             return [
@@ -945,7 +1042,7 @@ class TestFetchServerMessagesImpl:
                                 ChannelMessages(
                                     channel_name="active",
                                     channel_id=2,
-                                    messages=[{"id": 1}],
+                                    messages=[Message(id=1)],
                                 ),
                             ]
 
@@ -1110,7 +1207,7 @@ class TestFetchServerMessagesImpl:
                         guild = Mock(spec=discord.Guild)
                         guild.name = "Test"
                         guild.id = 123
-                        guild.channels = []
+                        guild.text_channels = []
                         fetcher._client.guilds = [guild]
 
                         async def mock_fetch(channels, after, before):
@@ -1169,9 +1266,13 @@ class TestFetchServerMessages:
                         fetcher._client.is_closed = Mock(return_value=False)
                         fetcher._client.close = AsyncMock()
 
-                        # Mock implementation that takes too long
+                        # Mock implementation that takes too long; like the
+                        # real impl, its finally owns the client close.
                         async def mock_impl(server_name, hours):
-                            await asyncio.sleep(10)  # Too long
+                            try:
+                                await asyncio.sleep(10)  # Too long
+                            finally:
+                                await fetcher._client.close()
                             return ServerDigestData(
                                 server_name=server_name,
                                 server_id=123,
@@ -1187,7 +1288,7 @@ class TestFetchServerMessages:
                             await fetcher.fetch_server_messages("Test Server", hours=6, timeout=0.1)
 
                         assert "timed out" in str(exc_info.value).lower()
-                        # Client should be closed on timeout
+                        # Closed exactly once, by the impl's finally
                         fetcher._client.close.assert_called_once()
 
     @pytest.mark.asyncio
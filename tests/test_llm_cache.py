@@ -0,0 +1,103 @@
+"""Tests for the exact-match LLM response cache."""
+
+from unittest.mock import patch
+
+from discord_chat.services.llm.cache import (
+    LLMCache,
+    cache_enabled,
+    cache_key,
+    get_cache,
+)
+
+
+class TestCacheKey:
+    """Tests for cache key computation."""
+
+    def test_cache_key_deterministic(self):
+        """Same inputs always produce the same key."""
+        a = cache_key("model-x", "system", "user")
+        b = cache_key("model-x", "system", "user")
+        assert a == b
+
+    def test_cache_key_varies_with_inputs(self):
+        """Changing any component produces a different key."""
+        base = cache_key("model-x", "system", "user")
+        assert cache_key("model-y", "system", "user") != base
+        assert cache_key("model-x", "other", "user") != base
+        assert cache_key("model-x", "system", "other") != base
+
+
+class TestLLMCache:
+    """Tests for the sqlite-backed cache."""
+
+    def test_get_returns_none_on_miss(self, tmp_path):
+        """Missing keys return None."""
+        cache = LLMCache(tmp_path / "cache.db")
+        assert cache.get("nope") is None
+
+    def test_set_then_get_roundtrip(self, tmp_path):
+        """Stored responses come back unchanged."""
+        cache = LLMCache(tmp_path / "cache.db")
+        cache.set("key1", "model-x", "# Digest\n\ncontent")
+        assert cache.get("key1") == "# Digest\n\ncontent"
+
+    def test_expired_entries_return_none(self, tmp_path):
+        """Entries past their TTL behave as misses."""
+        cache = LLMCache(tmp_path / "cache.db")
+        cache.set("key1", "model-x", "stale", ttl=-1)
+        assert cache.get("key1") is None
+
+    def test_set_replaces_existing_entry(self, tmp_path):
+        """Re-setting a key overwrites the stored response."""
+        cache = LLMCache(tmp_path / "cache.db")
+        cache.set("key1", "model-x", "old")
+        cache.set("key1", "model-x", "new")
+        assert cache.get("key1") == "new"
+
+
+class TestSemanticLayer:
+    """Tests for the near-duplicate semantic lookup."""
+
+    def test_semantic_hit_for_near_duplicate_prompt(self, tmp_path):
+        """A prompt sharing almost all tokens matches the stored one."""
+        cache = LLMCache(tmp_path / "cache.db")
+        stored_prompt = "alice: deploy went fine\nbob: thanks for the update " * 20
+        cache.set("key1", "model-x", "digest text")
+        cache.set_semantic("key1", "My Server", stored_prompt)
+
+        near_duplicate = stored_prompt + "\ncarol: one new line"
+        assert cache.get_semantic("My Server", near_duplicate) == "digest text"
+
+    def test_semantic_miss_for_different_prompt(self, tmp_path):
+        """An unrelated prompt scores below the threshold."""
+        cache = LLMCache(tmp_path / "cache.db")
+        cache.set("key1", "model-x", "digest text")
+        cache.set_semantic("key1", "My Server", "alice: deploy went fine")
+
+        assert cache.get_semantic("My Server", "totally unrelated conversation") is None
+
+    def test_semantic_scoped_per_server(self, tmp_path):
+        """Identical prompts never cross server namespaces."""
+        cache = LLMCache(tmp_path / "cache.db")
+        cache.set("key1", "model-x", "digest text")
+        cache.set_semantic("key1", "Server A", "the exact same prompt")
+
+        assert cache.get_semantic("Server B", "the exact same prompt") is None
+
+
+class TestCacheGating:
+    """Tests for the opt-in environment gate."""
+
+    def test_cache_disabled_by_default(self):
+        """Without the env var, the cache is off and get_cache returns None."""
+        with patch.dict("os.environ", {}, clear=False):
+            import os
+
+            os.environ.pop("DISCORD_CHAT_LLM_CACHE", None)
+            assert not cache_enabled()
+            assert get_cache() is None
+
+    def test_cache_enabled_via_env(self):
+        """DISCORD_CHAT_LLM_CACHE=1 turns the feature on."""
+        with patch.dict("os.environ", {"DISCORD_CHAT_LLM_CACHE": "1"}):
+            assert cache_enabled()
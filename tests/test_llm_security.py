@@ -7,7 +7,6 @@ These tests verify critical security features:
 - MT-016: TLS certificate verification enabled for OpenAI
 """
 
-import builtins
 import logging
 from unittest.mock import MagicMock, patch
 
@@ -37,32 +36,33 @@ def reset_security_logger():
     security_module._security_logger = None
 
 
+@pytest.fixture(autouse=True)
+def _clear_client_caches():
+    """Reset the memoized API clients so each test sees fresh constructions."""
+    import discord_chat.services.llm.claude as claude_module
+    import discord_chat.services.llm.openai_provider as openai_module
+
+    claude_module._get_client.cache_clear()
+    openai_module._get_client.cache_clear()
+    yield
+
+
 class TestImportErrorHandling:
     """Tests for missing package scenarios (MT-004, MT-005).
 
     These tests verify that users get clear error messages when
     required packages (anthropic, openai, httpx) are not installed.
+    The SDKs are imported at module load with a None fallback, so a
+    missing package is simulated by nulling the module global.
     """
 
     def test_claude_missing_anthropic_package(self):
-        """MT-004: Test error when anthropic package not installed.
-
-        This tests the ImportError path in claude.py:42-43.
-        """
-        # Create a mock that raises ImportError
-        original_import = builtins.__import__
-
-        def mock_import(name, *args, **kwargs):
-            if name == "anthropic":
-                raise ImportError("No module named 'anthropic'")
-            return original_import(name, *args, **kwargs)
+        """MT-004: Test error when anthropic package not installed."""
+        import discord_chat.services.llm.claude as claude_module
+        from discord_chat.services.llm.claude import ClaudeProvider
 
-        # Need to reload the module to trigger the import
         with patch.dict("os.environ", CLAUDE_ENV):
-            with patch.object(builtins, "__import__", mock_import):
-                # Import fresh to trigger the error
-                from discord_chat.services.llm.claude import ClaudeProvider
-
+            with patch.object(claude_module, "anthropic", None):
                 provider = ClaudeProvider()
 
                 with pytest.raises(LLMError) as exc_info:
@@ -74,17 +74,11 @@ class TestImportErrorHandling:
 
     def test_claude_missing_httpx_package(self):
         """Test error when httpx package not installed for Claude."""
-        original_import = builtins.__import__
-
-        def mock_import(name, *args, **kwargs):
-            if name == "httpx":
-                raise ImportError("No module named 'httpx'")
-            return original_import(name, *args, **kwargs)
+        import discord_chat.services.llm.claude as claude_module
+        from discord_chat.services.llm.claude import ClaudeProvider
 
         with patch.dict("os.environ", CLAUDE_ENV):
-            with patch.object(builtins, "__import__", mock_import):
-                from discord_chat.services.llm.claude import ClaudeProvider
-
+            with patch.object(claude_module, "httpx", None):
                 provider = ClaudeProvider()
 
                 with pytest.raises(LLMError) as exc_info:
@@ -95,21 +89,12 @@ class TestImportErrorHandling:
                 assert "pip install" in error_msg or "required" in error_msg
 
     def test_openai_missing_openai_package(self):
-        """MT-005: Test error when openai package not installed.
-
-        This tests the ImportError path in openai_provider.py:42-43.
-        """
-        original_import = builtins.__import__
-
-        def mock_import(name, *args, **kwargs):
-            if name == "openai":
-                raise ImportError("No module named 'openai'")
-            return original_import(name, *args, **kwargs)
+        """MT-005: Test error when openai package not installed."""
+        import discord_chat.services.llm.openai_provider as openai_module
+        from discord_chat.services.llm.openai_provider import OpenAIProvider
 
         with patch.dict("os.environ", OPENAI_ENV):
-            with patch.object(builtins, "__import__", mock_import):
-                from discord_chat.services.llm.openai_provider import OpenAIProvider
-
+            with patch.object(openai_module, "openai", None):
                 provider = OpenAIProvider()
 
                 with pytest.raises(LLMError) as exc_info:
@@ -121,17 +106,11 @@ class TestImportErrorHandling:
 
     def test_openai_missing_httpx_package(self):
         """Test error when httpx package not installed for OpenAI."""
-        original_import = builtins.__import__
-
-        def mock_import(name, *args, **kwargs):
-            if name == "httpx":
-                raise ImportError("No module named 'httpx'")
-            return original_import(name, *args, **kwargs)
+        import discord_chat.services.llm.openai_provider as openai_module
+        from discord_chat.services.llm.openai_provider import OpenAIProvider
 
         with patch.dict("os.environ", OPENAI_ENV):
-            with patch.object(builtins, "__import__", mock_import):
-                from discord_chat.services.llm.openai_provider import OpenAIProvider
-
+            with patch.object(openai_module, "httpx", None):
                 provider = OpenAIProvider()
 
                 with pytest.raises(LLMError) as exc_info:
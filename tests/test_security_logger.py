@@ -52,7 +52,37 @@ class TestSecurityLogger:
             logger = SecurityLogger(str(log_file))
             assert logger.logger.propagate is False
 
-    def test_sanitize_details_redacts_sensitive_keys(self):
+    def test_queue_handler_enqueues_records_unserialized(self):
+        """prepare() must not format: serialization belongs to the listener."""
+        import queue
+
+        payload = security_module._LazyJSON({"event_type": "api_call"})
+        record = logging.LogRecord(
+            "discord_chat.security", logging.INFO, __file__, 0, "%s", (payload,), None
+        )
+
+        handler = security_module._DeferredQueueHandler(queue.SimpleQueue())
+        prepared = handler.prepare(record)
+
+        # Stdlib prepare() would have stringified msg and cleared args,
+        # paying for the JSON encode on the producer thread.
+        assert prepared.args == (payload,)
+        assert prepared.msg == "%s"
+
+    def test_events_reach_the_log_file(self):
+        """Queued events land on disk as JSON once the queue drains."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "test_security.log"
+            test_logger = logging.getLogger("discord_chat.security")
+            test_logger.handlers.clear()
+
+            logger = SecurityLogger(str(log_file))
+            logger.log_event(SecurityEventType.API_CALL, "test event")
+            logger.flush()
+
+            content = log_file.read_text()
+            assert '"event_type": "api_call"' in content or '"event_type":"api_call"' in content
+            assert "test event" in content
         """Test that sensitive keys are redacted."""
         details = {
             "api_key": "secret123",
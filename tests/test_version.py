@@ -1,14 +1,11 @@
 """Tests for version command."""
 
-from click.testing import CliRunner
-
 from cli import main
 from discord_chat.commands.version import get_version
 
 
-def test_version_command():
+def test_version_command(runner):
     """Test that version command runs successfully."""
-    runner = CliRunner()
     result = runner.invoke(main, ["version"])
     assert result.exit_code == 0
     assert "version" in result.output.lower()